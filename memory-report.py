@@ -0,0 +1,105 @@
+import sys
+import random
+import tracemalloc
+from modules.Evolution import Evolution
+from modules.Author import Author
+from modules.Paper import Paper
+from modules.Topic import Topic
+from modules.Type import Type
+
+'''
+Script runs one evolution and reports the measured memory used per Author, Topic and Type object, and by the author and paper stores
+The Author memory is also given per (topic, paper) entry of the author collections and per field, to compare with other representations
+    The baseline Author class, with the collection as { topicID: [paperIDs] } and no other indexes, measured 186 bytes per entry
+    on the 500 paper model 1 run, e.g. python memory-report.py 500 1
+Usage: python memory-report.py [newPapers] [modelType]
+'''
+
+MODEL_CLASSES = (Author, Paper, Topic, Type)
+
+def deepSize(obj, seen=None):
+    '''
+    Returns the size in bytes of the model object and the containers it holds
+    Other model objects and the shared author store are not followed, they are reported on their own
+    '''
+    if seen is None:
+        seen = set()
+    size = sys.getsizeof(obj)
+    # slotted classes have no instance dict, unslotted classes are measured with theirs
+    if hasattr(obj, '__dict__'):
+        fields = vars(obj)
+        size += sys.getsizeof(fields)
+    else:
+        fields = {slot: getattr(obj, slot) for slot in type(obj).__slots__ if hasattr(obj, slot)}
+    for field, value in fields.items():
+        if field not in ('store', 'listeners'):
+            size += containerSize(value, seen)
+    return size
+
+def containerSize(obj, seen):
+    '''
+    Returns the size in bytes of the object and the objects it contains, model objects are not counted
+    '''
+    if id(obj) in seen or isinstance(obj, MODEL_CLASSES):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(containerSize(key, seen) + containerSize(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(containerSize(item, seen) for item in obj)
+    return size
+
+def fieldReport(objects):
+    '''
+    Returns the bytes per object held by each field of the slotted objects, { field: bytes }
+    '''
+    fields = {}
+    for obj in objects:
+        for field in type(obj).__slots__:
+            if field not in ('store', 'listeners'):
+                fields[field] = fields.get(field, 0) + containerSize(getattr(obj, field), set())
+    return {field: total / len(objects) for field, total in fields.items()} if objects else fields
+
+def objectReport(name, objects):
+    '''
+    Returns a row of the report: (name, count, total bytes, bytes per object)
+    '''
+    total = sum(deepSize(obj) for obj in objects)
+    return name, len(objects), total, total / len(objects) if objects else 0
+
+if __name__ == "__main__":
+
+    newPapers = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    modelType = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    # bibsonomy parameters
+    random.seed(0)
+    tracemalloc.start()
+    model = Evolution(Pn=0.80, Pw=0.71, Pd=0.50)
+    model.evolve(modelType=modelType, newPapers=newPapers)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    authorStore = model.getNetwork().getAuthorStore()
+    storeBytes = authorStore.getNumBytes()
+
+    authors = [authorClass for authID, authorClass in model.getNetwork().getNetworkData()]
+    numEntries = sum(len(papers) for authorClass in authors for papers in authorClass.getData().values())
+    rows = [
+        objectReport('Author', authors),
+        objectReport('Topic', list(model.topics.values())),
+        objectReport('Type', list(model.types.values())),
+    ]
+
+    print(f'Model {modelType} with {newPapers} new papers')
+    print(f'{"Class":<10}{"Objects":>10}{"Total (KiB)":>14}{"Bytes/object":>14}')
+    for name, count, total, perObject in rows:
+        print(f'{name:<10}{count:>10}{total / 1024:>14.1f}{perObject:>14.1f}')
+    authorBytes = rows[0][2]
+    print(f'Author collection entries: {numEntries}, {authorBytes / max(numEntries, 1):.1f} bytes/entry')
+    print('Author bytes/object by field: ' + ', '.join(f'{field} {size:.0f}' for field, size in fieldReport(authors).items()))
+    print(f'Author store columns: {storeBytes / 1024:.1f} KiB, {storeBytes / max(authorStore.size, 1):.1f} bytes/author allocated')
+    paperBytes = model.papers.getNumBytes()
+    print(f'Paper store arrays: {paperBytes / 1024:.1f} KiB, {paperBytes / max(model.getNumPapers(), 1):.1f} bytes/paper allocated')
+    print(f'Traced memory after evolve: {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB')
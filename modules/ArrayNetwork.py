@@ -0,0 +1,220 @@
+import numpy as np
+import pickle
+from igraph import Graph as modularityGraph
+from .BaseNetwork import BaseNetwork
+from .ScholarNetwork import Graph
+from .ArrayUtils import growArray
+
+'''
+Graph class that stores the scholar network in integer indexed arrays instead of the networkx dict of dicts
+Authors are given an index in order of insertion, the neighbor indices and edge weights of each author are kept in growable numpy arrays
+Only converted to networkx or igraph for plotting and analysis
+'''
+class ArrayGraph(BaseNetwork):
+
+    def __init__(self, initialCapacity=4):
+        self.initIndexes()
+        self.initialCapacity = initialCapacity
+
+        # { authorID: index }, the index is the position of the author in self.authorIDs
+        self.indices = {}
+        self.authorClasses = []
+
+        # neighbor indices and edge weights of each author, only the first degree entries of the arrays are used
+        self.neighborArrays = []
+        self.weightArrays = []
+        self.degrees = np.zeros(initialCapacity, dtype=np.int64)
+        self.numEdges = 0
+
+    '''Access Methods'''
+    def getNetworkData(self):
+        return list(zip(self.authorIDs, self.authorClasses))
+
+    def getAuthorIDs(self):
+        return list(self.authorIDs)
+
+    def getAuthorClass(self, authID):
+        return self.authorClasses[self.indices[authID]]
+
+    def getNumAuthors(self):
+        return len(self.authorIDs)
+
+    def getNumEdges(self):
+        return self.numEdges
+
+    def getDegrees(self):
+        '''
+        Returns a list of the degrees of all authors
+        '''
+        return self.degrees[:len(self.authorIDs)].tolist()
+
+    def getDegree(self, authID):
+        return int(self.degrees[self.indices[authID]])
+
+    def getNeighborIndices(self, index):
+        return self.neighborArrays[index][:self.degrees[index]]
+
+    def getNeighborWeights(self, authID):
+        '''
+        Returns an iterator of (neighborID, edgeWeight) for the author
+        '''
+        index = self.indices[authID]
+        degree = self.degrees[index]
+        neighbors = [self.authorIDs[neighbor] for neighbor in self.neighborArrays[index][:degree].tolist()]
+        return zip(neighbors, self.weightArrays[index][:degree].tolist())
+
+    def findEdge(self, index, neighborIndex):
+        '''
+        Returns the position of neighborIndex in the arrays of the author at index, -1 if there is no edge
+        '''
+        positions = np.flatnonzero(self.getNeighborIndices(index) == neighborIndex)
+        return positions[0] if len(positions) else -1
+
+    def hasEdge(self, authID1, authID2):
+        return self.findEdge(self.indices[authID1], self.indices[authID2]) >= 0
+
+    def getEdgeWeight(self, authID1, authID2):
+        '''
+        Returns the weight of the edge between the authors, 0 if there is no edge
+        '''
+        index = self.indices[authID1]
+        position = self.findEdge(index, self.indices[authID2])
+        return int(self.weightArrays[index][position]) if position >= 0 else 0
+
+    '''Add Methods'''
+    def addAuthorNode(self, authID, authorClass):
+        self.indices[authID] = len(self.authorClasses)
+        self.authorClasses.append(authorClass)
+        self.neighborArrays.append(np.zeros(self.initialCapacity, dtype=np.int32))
+        self.weightArrays.append(np.zeros(self.initialCapacity, dtype=np.int64))
+        self.degrees = growArray(self.degrees, len(self.authorClasses))
+
+    def appendNeighbor(self, index, neighborIndex, weight):
+        degree = self.degrees[index]
+        self.neighborArrays[index] = growArray(self.neighborArrays[index], degree + 1)
+        self.weightArrays[index] = growArray(self.weightArrays[index], degree + 1)
+        self.neighborArrays[index][degree] = neighborIndex
+        self.weightArrays[index][degree] = weight
+        self.degrees[index] += 1
+
+    def incrementCoauthorEdges(self, authors, coauthorID):
+        '''
+        Function will increment the weights of the edges between all the authors and the new coauthor, creating edges that do not exist
+        Returns the list of touched edges as (authorID, coauthorID)
+        '''
+        coauthorIndex = self.indices[coauthorID]
+        touchedEdges = []
+        for author in authors:
+            if author == coauthorID:
+                continue
+            index = self.indices[author]
+            position = self.findEdge(coauthorIndex, index)
+            # if there is not an edge, create one in the arrays of both authors
+            if position < 0:
+                self.appendNeighbor(coauthorIndex, index, 1)
+                self.appendNeighbor(index, coauthorIndex, 1)
+                self.numEdges += 1
+                self.coauthorEdgeAdded(author, coauthorID)
+            else:
+                self.weightArrays[coauthorIndex][position] += 1
+                self.weightArrays[index][self.findEdge(index, coauthorIndex)] += 1
+            touchedEdges.append((author, coauthorID))
+
+        # cached sampling weights of the authors on the touched edges are no longer valid
+        self.sampler.invalidateEdges(touchedEdges)
+        return touchedEdges
+
+    def getInducedEdges(self, authors):
+        '''
+        Returns the authors in order of insertion and the unweighted edges of the subgraph induced by them
+        Edges are given as (i, j) positions in the returned authors, with i < j
+        '''
+        indices = np.array(sorted(self.indices[authID] for authID in authors), dtype=np.int64)
+        # position of every author in the community, -1 for authors outside of it
+        positions = np.full(len(self.authorIDs), -1, dtype=np.int64)
+        positions[indices] = np.arange(len(indices))
+        edges = []
+        for i, index in enumerate(indices.tolist()):
+            neighborPositions = positions[self.getNeighborIndices(index)]
+            # only keep edges to later authors in the community so that each edge is added once
+            edges.extend((i, j) for j in neighborPositions[neighborPositions > i].tolist())
+        return [self.authorIDs[index] for index in indices.tolist()], edges
+
+    def splitCommunity(self, authors, numClusters=2):
+        '''
+        Function will take the list of authors in the community, numClusters is how many clusters to split into
+            It will then test if it should split the community or not
+        Same as Graph.splitCommunity, but the igraph graph is built directly from the community edges
+        Returns a list of authors in the new community if community is split, False otherwise
+        '''
+        vertexAuthors, edges = self.getInducedEdges(authors)
+        newGraph = modularityGraph(n=len(vertexAuthors), edges=edges)
+
+        # create subgraph and split
+        try:
+            clusters = newGraph.community_leading_eigenvector(clusters=numClusters)
+        except:
+            return False
+
+        # compare unweighted modularity of new communities to the initial, return if there should not be change in community structure
+        if newGraph.modularity(set(vertexAuthors)) > clusters.modularity or len(clusters) != 2:
+            return False
+
+        # choose new cluster as the smaller one
+        index = 1 if len(clusters[1]) < len(clusters[0]) else 0
+
+        return [vertexAuthors[vertex] for vertex in clusters[index]]
+
+    '''Conversion Methods'''
+    def getEdges(self):
+        '''
+        Returns the list of all edges as (authorID, authorID, weight)
+        '''
+        edges = []
+        for index, authID in enumerate(self.authorIDs):
+            neighbors = self.getNeighborIndices(index)
+            weights = self.weightArrays[index][:self.degrees[index]]
+            laterNeighbors = neighbors > index
+            for neighbor, weight in zip(neighbors[laterNeighbors].tolist(), weights[laterNeighbors].tolist()):
+                edges.append((authID, self.authorIDs[neighbor], weight))
+        return edges
+
+    def toNetworkx(self):
+        '''
+        Returns the network as a networkx based Graph with the same author classes and store, used for plotting and analysis
+        The authors and edges are added with the model methods, so the indexes and the igraph mirror of the graph are built
+        The graph is a snapshot, the author classes only notify this network of later changes
+        '''
+        graph = Graph()
+        graph.authorStore = self.authorStore
+        graph.splitMethod = self.splitMethod
+        for authID, authorClass in self.getNetworkData():
+            graph.indexAuthor(authID, authorClass)
+            if authID in self.activeAuthors:
+                graph.activeAuthors.add(authID)
+        graph.retirementQueue = list(self.retirementQueue)
+        for authID1, authID2, weight in self.getEdges():
+            graph.incrementCoauthorEdges([authID1], authID2)
+            graph[authID1][authID2]['weight'] = weight
+        return graph
+
+    def toIgraph(self):
+        '''
+        Returns the network as an igraph graph, with the author IDs as the vertex names and the edge weights
+        '''
+        edges = self.getEdges()
+        return modularityGraph(n=len(self.authorIDs), edges=[(self.indices[u], self.indices[v]) for u, v, w in edges],
+                                vertex_attrs={'name': self.getAuthorIDs()}, edge_attrs={'weight': [w for u, v, w in edges]})
+
+    '''Plotting Related Functions'''
+    def plotPyvisGraph(self, filename='pyvis.html', network=None, notebook=False):
+        return self.toNetworkx().plotPyvisGraph(filename=filename, network=network, notebook=notebook)
+
+    def plotNetwork(self):
+        self.toNetworkx().plotNetwork()
+
+    def saveNetworkWithPickle(self, fileName='evolutionNetwork.net', network=None):
+        net = self if not network else network
+        with open(fileName, 'wb') as outfile:
+            pickle.dump(net, outfile)
+        print(f'Saved to {fileName} successfully!')
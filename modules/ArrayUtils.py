@@ -0,0 +1,16 @@
+import numpy as np
+
+'''
+Functions shared by the classes that keep their data in growable numpy arrays
+'''
+
+def growArray(array, minSize, fillValue=0):
+    '''
+    Returns the array with a capacity of at least minSize, doubling the capacity when it grows
+    New entries are set to fillValue
+    '''
+    if len(array) >= minSize:
+        return array
+    newArray = np.full(max(minSize, 2 * len(array)), fillValue, dtype=array.dtype)
+    newArray[:len(array)] = array
+    return newArray
@@ -1,36 +1,112 @@
 import math
 import pandas as pd
+from .AuthorStore import AuthorStore
+
+# papers of a topic are kept in a list up to this many, and in a set above it, a set takes at least 216 bytes
+MAX_LIST_PAPERS = 8
 
 class Author:
     '''
     Class defines the author in a given network
+    The scalar fields are kept in a row of the AuthorStore, so that they can be read for all authors at once
+    If no store is given, the author will create its own
     '''
-    def __init__(self, id, birthIteration, initialData={}):
+    # slots instead of a per instance dict, there is one instance for every author in the model
+    __slots__ = ('id', 'name', 'store', 'row', 'collection', 'disciplines', 'maxCount', 'paperCredit', 'listeners')
+
+    def __init__(self, id, birthIteration, initialData={}, store=None):
 
         # identification
         self.id = id
         self.name = 'Something'
 
-        # used to infer age
-        self.birthIteration = birthIteration
+        # row of the author in the store, also holds the birthIteration used to infer age
+        self.store = AuthorStore() if store is None else store
+        self.row = self.store.addAuthor(id, birthIteration)
 
         '''
         Main data collection, stored in the following format:
             {
-                TopicID1: [PaperIDs],
-                TopicID2: [PaperIDs],
+                TopicID1: [PaperIDs] or {PaperIDs},
+                TopicID2: [PaperIDs] or {PaperIDs},
             }
+        Most topics of an author have a few papers, those are kept in a list, the topics with more than MAX_LIST_PAPERS in a set
         '''
-        self.collection = initialData
+        self.collection = {}
+
+        # topics with the most papers and their number of papers, kept up to date as the counts change by one
+        # an author has few disciplines, so a tuple is kept instead of a set
+        self.disciplines = ()
+        self.maxCount = 0
+        for topicID, papers in initialData.items():
+            for paperID in papers:
+                self.addPaperToTopics(paperID, [topicID])
 
-        # credit accumulation
-        self.credit = 1
-        self.type = None
+        # credit accumulation, the credit and type are kept in the store
         self.paperCredit = {}
 
-        # measures
-        self.numPapers = 0
-        self.numTopics = 0
+        # objects notified when the topics or disciplines of the author change, e.g. the network indexes
+        self.listeners = []
+
+    def addListener(self, listener):
+        '''
+        Listener must implement the following methods:
+            authorTopicsChanged(authID, addedTopics, removedTopics)
+            authorDisciplineChanged(authID, oldDisciplines, newDisciplines)
+            authorCreditChanged(authID, creditChange)
+            authorTypeChanged(authID, oldType, newType)
+        '''
+        self.listeners.append(listener)
+
+    def notifyTopicsChange(self, addedTopics, removedTopics):
+        if addedTopics or removedTopics:
+            for listener in self.listeners:
+                listener.authorTopicsChanged(self.id, addedTopics, removedTopics)
+
+    def notifyDisciplineChange(self, oldDisciplines):
+        '''
+        Function will notify the listeners if the disciplines of the author differ from oldDisciplines
+        '''
+        newDisciplines = self.getAuthorDiscipline()
+        if set(oldDisciplines) != set(newDisciplines):
+            for listener in self.listeners:
+                listener.authorDisciplineChanged(self.id, oldDisciplines, newDisciplines)
+
+    '''Store Backed Fields'''
+    @property
+    def birthIteration(self):
+        return int(self.store.birthIteration[self.row])
+
+    @property
+    def credit(self):
+        return float(self.store.credit[self.row])
+
+    @credit.setter
+    def credit(self, credit):
+        creditChange = credit - self.credit
+        self.store.setCredit(self.row, credit)
+        for listener in self.listeners:
+            listener.authorCreditChanged(self.id, creditChange)
+
+    @property
+    def type(self):
+        return self.store.getType(self.row)
+
+    @property
+    def numPapers(self):
+        return int(self.store.numPapers[self.row])
+
+    @numPapers.setter
+    def numPapers(self, numPapers):
+        self.store.numPapers[self.row] = numPapers
+
+    @property
+    def numTopics(self):
+        return int(self.store.numTopics[self.row])
+
+    @numTopics.setter
+    def numTopics(self, numTopics):
+        self.store.numTopics[self.row] = numTopics
 
     def getData(self):
         return self.collection
@@ -65,12 +141,13 @@ class Author:
     
     def getAuthorPapers(self):
         '''
-        Returns a list of all author papers
+        Returns a list of all author papers, built from the papers of the topics
+        The topics of a paper are kept in the PaperStore, the author does not keep a second copy of them
         '''
-        allPapers = set()
-        for top, papers in self.collection.items():
-            allPapers.update(papers)
-        return list(allPapers)
+        return list(set().union(*self.collection.values()))
+
+    def hasPaper(self, paperID):
+        return any(paperID in papers for papers in self.collection.values())
 
     def getAuthorTopics(self):
         topics = [top for top, papers in self.collection.items()]
@@ -82,16 +159,26 @@ class Author:
         For each author, the topic that contains the most papers would be their assigned discipline
             If there is a tie, then the function returns all discipline IDs
         '''
-        maxVal = 0
-        disciplines = []
-        for top, papers in self.collection.items():
-            numPapers = len(papers)
-            if numPapers == maxVal:
-                disciplines.append(top)
-            elif numPapers > maxVal:
-                maxVal = numPapers
-                disciplines = [top]
-        return disciplines
+        return list(self.disciplines)
+
+    def moveTopicCount(self, topicID, oldCount, newCount):
+        '''
+        Function will update the disciplines when the number of papers of the topic changes by one
+        Only when the last discipline loses a paper are the topics scanned, for the ones with one paper less
+        '''
+        if newCount > oldCount:
+            if newCount > self.maxCount:
+                self.maxCount = newCount
+                self.disciplines = (topicID,)
+            elif newCount == self.maxCount:
+                self.disciplines += (topicID,)
+        elif oldCount == self.maxCount:
+            self.disciplines = tuple(discipline for discipline in self.disciplines if discipline != topicID)
+            if not self.disciplines:
+                # every other topic has at most newCount papers, and the topic itself has newCount
+                self.maxCount = newCount
+                if newCount > 0:
+                    self.disciplines = tuple(topic for topic, papers in self.collection.items() if len(papers) == newCount)
 
     '''Print Methods'''
     def getAuthorPapersStr(self):
@@ -113,40 +200,110 @@ class Author:
         self.paperCredit[paperID] = creditAmount
         self.credit += creditAmount
 
+    def setPaperCredit(self, paperID, creditAmount):
+        '''
+        Records the credit of the paper without adding it to the author, used when the credit was added in the store
+        '''
+        self.paperCredit[paperID] = creditAmount
+
     def setType(self, type):
-        self.type = type
+        oldType = self.type
+        self.store.setType(self.row, type)
+        for listener in self.listeners:
+            listener.authorTypeChanged(self.id, oldType, type)
 
-    def insertPaper(self, paperID, topics):
+    def addPaperToTopics(self, paperID, topics):
         '''
-        Function will insert a new paper into the author
+        Returns the list of topics that are new to the author
         '''
+        newTopics = []
         for topicID in topics:
             if topicID not in self.collection:
                 self.collection[topicID] = []
-            if paperID not in self.collection[topicID]:
-                self.collection[topicID].append(paperID)
+                newTopics.append(topicID)
+            topicPapers = self.collection[topicID]
+            if paperID not in topicPapers:
+                if isinstance(topicPapers, set):
+                    topicPapers.add(paperID)
+                elif len(topicPapers) < MAX_LIST_PAPERS:
+                    topicPapers.append(paperID)
+                else:
+                    topicPapers = self.collection[topicID] = set(topicPapers)
+                    topicPapers.add(paperID)
+                numPapers = len(topicPapers)
+                self.moveTopicCount(topicID, numPapers - 1, numPapers)
+        return newTopics
+
+    def removePaperFromTopics(self, paperID, topics):
+        '''
+        Removes the paper from the given topics, returns the list of topics that no longer have papers and were removed
+        '''
+        emptyTopics = []
+        for topicID in topics:
+            topicPapers = self.collection.get(topicID)
+            if topicPapers is None or paperID not in topicPapers:
+                continue
+            topicPapers.remove(paperID)
+            numPapers = len(topicPapers)
+            self.moveTopicCount(topicID, numPapers + 1, numPapers)
+            if numPapers == 0:
+                del self.collection[topicID]
+                emptyTopics.append(topicID)
+        return emptyTopics
+
+    def insertPaper(self, paperID, topics):
+        '''
+        Function will insert a new paper into the author
+        '''
+        oldDisciplines = self.getAuthorDiscipline()
+        newTopics = self.addPaperToTopics(paperID, topics)
+
         # update measures
         self.numPapers += 1
         self.numTopics = len(self.collection.keys())
+        self.notifyTopicsChange(newTopics, [])
+        self.notifyDisciplineChange(oldDisciplines)
 
-    def updateAuthor(self, paperID, paperTopics):
+    def updateAuthor(self, paperID, oldTopics, paperTopics):
         '''
-        Function will update an author when a paper's topics are changed
+        Function will update an author when a paper's topics are changed from oldTopics to paperTopics
         '''
-        # remove paper from old topics
-        for topID, papers in self.collection.items():
-            if paperID in papers:
-                papers.remove(paperID)
+        self.updateAuthorPapers({paperID: (oldTopics, paperTopics)})
+
+    def updateAuthorPapers(self, papers):
+        '''
+        Function will update an author when the topics of many papers are changed
+        papers: { paperID: ([oldTopics], [topics]) }, the old topics are read from the PaperStore before the relabel
+        Only the topics that a paper lost or gained are updated, so a relabel costs O(change) instead of O(topics of the paper)
+        '''
+        oldDisciplines = self.getAuthorDiscipline()
+
+        # topics can be emptied by one paper and added back by another
+        addedTopics = set()
+        removedTopics = set()
+        for paperID, (paperOldTopics, paperTopics) in papers.items():
+            oldTopics = set(paperOldTopics)
+            newTopics = set(paperTopics)
+            lostTopics = [topicID for topicID in paperOldTopics if topicID not in newTopics]
+
+            # remove paper from the topics it lost, removing the topics that are empty
+            for topicID in self.removePaperFromTopics(paperID, lostTopics):
+                if topicID in addedTopics:
+                    addedTopics.remove(topicID)
+                else:
+                    removedTopics.add(topicID)
 
-        # add paper to new topics, subtract self.numPapers since paper exists
-        self.numPapers -= 1
-        self.insertPaper(paperID, paperTopics)
-        
-        # Remove topics from author that are empty
-        self.collection = {k: papers for k, papers in self.collection.items() if len(papers) > 0}
+            # add paper to the topics it gained, number of papers stays the same since paper exists
+            for topicID in self.addPaperToTopics(paperID, [topicID for topicID in paperTopics if topicID not in oldTopics]):
+                if topicID in removedTopics:
+                    removedTopics.remove(topicID)
+                else:
+                    addedTopics.add(topicID)
 
         # update measure
         self.numTopics = len(self.collection.keys())
+        self.notifyTopicsChange(list(addedTopics), list(removedTopics))
+        self.notifyDisciplineChange(oldDisciplines)
 
     def __repr__(self):
         print('Not implemented')
\ No newline at end of file
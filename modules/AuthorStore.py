@@ -0,0 +1,123 @@
+import numpy as np
+from .ArrayUtils import growArray
+
+class AuthorStore:
+    '''
+    Class stores the scalar fields of the authors in contiguous numpy arrays, indexed by the row of the author
+    Rows are given to authors in order of insertion. The Author classes are views that read and write their row
+    '''
+    def __init__(self, initialCapacity=16):
+        # { authorID: row }
+        self.rows = {}
+        self.size = 0
+
+        # columns
+        self.ids = np.zeros(initialCapacity, dtype=np.int64)
+        self.birthIteration = np.zeros(initialCapacity, dtype=np.int64)
+        self.credit = np.ones(initialCapacity, dtype=np.float64)
+        # log of the reputation, log(sqrt(credit)), cached for the walk weights and updated whenever the credit changes
+        self.logReputation = np.zeros(initialCapacity, dtype=np.float64)
+        self.typeIDs = np.full(initialCapacity, -1, dtype=np.int64)
+        self.numPapers = np.zeros(initialCapacity, dtype=np.int64)
+        self.numTopics = np.zeros(initialCapacity, dtype=np.int64)
+
+        # { typeID: Type } for the types that have been given to authors, and the credit scalar of each typeID
+        self.types = {}
+        self.typeScalars = np.zeros(0, dtype=np.float64)
+
+    def grow(self, minSize):
+        '''
+        Doubles the capacity of all columns when they cannot hold minSize rows
+        '''
+        for column, fillValue in [('ids', 0), ('birthIteration', 0), ('credit', 1), ('logReputation', 0), ('typeIDs', -1), ('numPapers', 0), ('numTopics', 0)]:
+            setattr(self, column, growArray(getattr(self, column), minSize, fillValue))
+
+    def addAuthor(self, authID, birthIteration):
+        '''
+        Adds a row for the author, returns the row
+        '''
+        self.grow(self.size + 1)
+        row = self.size
+        self.rows[authID] = row
+        self.ids[row] = authID
+        self.birthIteration[row] = birthIteration
+        self.size += 1
+        return row
+
+    def setCredit(self, row, credit):
+        self.credit[row] = credit
+        self.logReputation[row] = 0.5 * np.log(credit)
+
+    def setType(self, row, typeClass):
+        if typeClass.id not in self.types:
+            self.types[typeClass.id] = typeClass
+            if typeClass.id >= len(self.typeScalars):
+                self.typeScalars = np.concatenate([self.typeScalars, np.zeros(typeClass.id + 1 - len(self.typeScalars))])
+            self.typeScalars[typeClass.id] = typeClass.scalar
+        self.typeIDs[row] = typeClass.id
+
+    def getType(self, row):
+        return self.types.get(int(self.typeIDs[row]))
+
+    def addPaperCredit(self, rows, baseCredit):
+        '''
+        Gives every author row the baseCredit multiplied by the scalar of their type, in one step
+        The rows must be unique, i.e. the authors of one paper
+        Returns the credit amount of each row and the total credit given to each typeID
+        '''
+        rowTypes = self.typeIDs[rows]
+        amounts = baseCredit * self.typeScalars[rowTypes]
+        self.credit[rows] += amounts
+        self.logReputation[rows] = 0.5 * np.log(self.credit[rows])
+        typeTotals = np.bincount(rowTypes, weights=amounts, minlength=len(self.typeScalars))
+        return amounts, typeTotals
+
+    '''Access Methods'''
+    def getNumBytes(self):
+        '''
+        Returns the number of bytes allocated by the columns of the store
+        '''
+        return sum(array.nbytes for array in [self.ids, self.birthIteration, self.credit, self.logReputation, self.typeIDs, self.numPapers, self.numTopics])
+
+    def getRow(self, authID):
+        return self.rows[authID]
+
+    def getRows(self, authIDs):
+        return np.array([self.rows[authID] for authID in authIDs], dtype=np.int64)
+
+    def getIDs(self):
+        return self.ids[:self.size]
+
+    def getCredits(self):
+        return self.credit[:self.size]
+
+    def getWalkWeights(self, authIDs, edgeWeights):
+        '''
+        Returns the weights of walking to each author: the edge weight times the cached log reputation of the author
+        '''
+        return np.asarray(edgeWeights, dtype=np.float64) * self.logReputation[self.getRows(authIDs)]
+
+    def getTypeIDs(self):
+        return self.typeIDs[:self.size]
+
+    def getNumPapers(self):
+        return self.numPapers[:self.size]
+
+    def getNumTopics(self):
+        return self.numTopics[:self.size]
+
+    def getAges(self, currentIteration):
+        return currentIteration - self.birthIteration[:self.size]
+
+    def getActiveMask(self, currentIteration, maxAge):
+        '''
+        Returns a boolean array of the authors that are below the maxAge
+        '''
+        return self.getAges(currentIteration) < maxAge
+
+    def getTypeNames(self):
+        '''
+        Returns a list of the type name of all authors, None for authors without a type
+        '''
+        names = {typeID: typeClass.name for typeID, typeClass in self.types.items()}
+        return [names.get(typeID) for typeID in self.getTypeIDs().tolist()]
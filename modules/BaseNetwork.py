@@ -0,0 +1,558 @@
+import math
+import random
+import heapq
+import numpy as np
+import pandas as pd
+from .Author import Author
+from .AuthorStore import AuthorStore
+from .Sampler import WeightedSampler, weightedChoice
+from .RandomSet import RandomSet
+from .SpectralSplit import leadingEigenvectorClusters, partitionModularity
+
+# split methods of setSplitMethod
+SPLIT_METHODS = ('igraph', 'spectral')
+
+'''
+Base class with the methods used for scholar evolution that do not depend on how the graph is stored
+Subclasses must implement the following storage methods:
+    addAuthorNode(authID, authorClass)
+    getAuthorClass(authID)
+    getAuthorIDs()
+    getNetworkData()
+    getNeighborWeights(authID)
+    getDegrees()
+    incrementCoauthorEdges(authors, coauthorID), calling coauthorEdgeAdded for every new edge
+    getInducedEdges(authors)
+    splitCommunity(authors)
+Definitions:
+    Discipline: defines the top topic of the author, i.e. the topic with the most papers
+'''
+class BaseNetwork:
+
+    def initIndexes(self):
+        # inverted index of the disciplines, in the form { topicID: {authorIDs} }
+        self.disciplineIndex = {}
+        # running totals of each discipline, kept with the discipline index, in the form { topicID: credit } and { topicID: { typeID: numAuthors } }
+        self.disciplineCredit = {}
+        self.disciplineTypeCounts = {}
+        # version of each discipline, increased whenever its authors or the edges between them change
+        self.disciplineVersions = {}
+        # version of each discipline when its last split attempt was rejected, in the form { topicID: version }
+        self.rejectedSplits = {}
+        # 'igraph' splits with splitCommunity, 'spectral' splits with spectralSplitCommunity
+        self.splitMethod = 'igraph'
+        # inverted index of all author topics, in the form { topicID: {authorIDs} }
+        self.topicIndex = {}
+        # number of edges between the authors of each topic, in the form { topicID: numEdges }, used for merging
+        self.topicInternalEdges = {}
+        # samples the coauthors during the random walks
+        self.sampler = WeightedSampler()
+        # all author IDs in order of insertion, and the authors that are still active, used for sampling authors
+        self.authorIDs = []
+        self.activeAuthors = RandomSet()
+        # heap of (birthIteration, authorID) of the active authors, used to retire them once they reach the max age
+        self.retirementQueue = []
+        # authors that have papers in at least two topics, used for selecting merge events
+        self.multiTopicAuthors = RandomSet()
+        # scalar fields of all authors in numpy arrays, the author classes are views of their rows
+        self.authorStore = AuthorStore()
+
+    '''Access Methods'''
+    def randomAuthor(self, activeOnly=False):
+        '''
+        Returns a uniformly chosen author ID, only choosing from the active authors if activeOnly
+        If every author has retired, the author is chosen from all authors
+        '''
+        if activeOnly and len(self.activeAuthors) > 0:
+            return self.activeAuthors.choice()
+        return random.choice(self.authorIDs)
+
+    def randomMultiTopicAuthor(self):
+        '''
+        Returns a uniformly chosen author with at least two topics, None if there are no such authors
+        '''
+        if len(self.multiTopicAuthors) == 0:
+            return None
+        return self.multiTopicAuthors.choice()
+
+    def getAuthorPapers(self, authID):
+        '''
+        Returns a list of all author papers
+        '''
+        return self.getAuthorClass(authID).getAuthorPapers()
+
+    def getAuthorData(self, authID):
+        return self.getAuthorClass(authID).getData()
+
+    def getAuthorStore(self):
+        return self.authorStore
+
+    '''Add Author Method'''
+    def addAuthor(self, authID, birthIteration, initialData={}):
+        '''
+        Will add the author with the authID to the network
+        data is the initial data to declare the author with
+        '''
+        authorClass = Author(authID, birthIteration=birthIteration, initialData=initialData, store=self.authorStore)
+        authorClass.addListener(self)
+        self.indexAuthor(authID, authorClass)
+        self.activeAuthors.add(authID)
+        heapq.heappush(self.retirementQueue, (birthIteration, authID))
+
+    def indexAuthor(self, authID, authorClass):
+        '''
+        Adds the node of an existing author class and adds the author to the topic and discipline indexes
+        The row of the author must be in self.authorStore
+        '''
+        self.addAuthorNode(authID, authorClass)
+        self.authorIDs.append(authID)
+        self.authorTopicsChanged(authID, authorClass.getAuthorTopics(), [])
+        self.authorDisciplineChanged(authID, [], authorClass.getAuthorDiscipline())
+
+    def retireAuthor(self, authID):
+        '''
+        Removes the author from the active authors, the author stays in the network
+        The cached sampling weights of the neighbors include the author, so they are no longer valid
+        '''
+        if authID in self.activeAuthors:
+            self.activeAuthors.discard(authID)
+            self.sampler.invalidate([neighbor for neighbor, weight in self.getNeighborWeights(authID)])
+
+    def retireAuthors(self, currentIteration, maxAge):
+        '''
+        Retires all authors whose age at currentIteration has reached maxAge
+        Each author is popped from the retirement queue once, so the cost only depends on the number of newly retired authors
+        '''
+        while self.retirementQueue and currentIteration - self.retirementQueue[0][0] >= maxAge:
+            birthIteration, authID = heapq.heappop(self.retirementQueue)
+            self.retireAuthor(authID)
+
+    '''Index Methods'''
+    def authorTopicsChanged(self, authID, addedTopics, removedTopics):
+        '''
+        Called by the author class whenever the author gains or loses a topic, keeps the topic index and the internal edges of the topics updated
+        '''
+        for topicID in removedTopics:
+            self.topicIndex[topicID].discard(authID)
+            if len(self.topicIndex[topicID]) == 0:
+                del self.topicIndex[topicID]
+                del self.topicInternalEdges[topicID]
+            else:
+                self.topicInternalEdges[topicID] -= self.countNeighborsIn(authID, self.topicIndex[topicID])
+        for topicID in addedTopics:
+            if topicID not in self.topicIndex:
+                self.topicIndex[topicID] = set()
+                self.topicInternalEdges[topicID] = 0
+            self.topicInternalEdges[topicID] += self.countNeighborsIn(authID, self.topicIndex[topicID])
+            self.topicIndex[topicID].add(authID)
+
+        if len(self.getAuthorData(authID)) > 1:
+            self.multiTopicAuthors.add(authID)
+        else:
+            self.multiTopicAuthors.discard(authID)
+
+    def coauthorEdgeAdded(self, authID1, authID2):
+        '''
+        Called by the storage classes whenever a new edge is created, the edge is internal to every topic that both authors share
+        '''
+        topics1 = self.getAuthorData(authID1)
+        topics2 = self.getAuthorData(authID2)
+        if len(topics2) < len(topics1):
+            topics1, topics2 = topics2, topics1
+        for topicID in topics1:
+            if topicID in topics2:
+                self.topicInternalEdges[topicID] += 1
+
+        # the edge changes the subgraph of the disciplines that both authors are in
+        disciplines2 = self.getAuthorDiscipline(authID2)
+        for topicID in self.getAuthorDiscipline(authID1):
+            if topicID in disciplines2:
+                self.updateDisciplineVersion(topicID)
+
+    def countNeighborsIn(self, authID, authors):
+        '''
+        Returns the number of neighbors of the author that are in the set of authors
+        '''
+        return sum(1 for neighbor, weight in self.getNeighborWeights(authID) if neighbor in authors)
+
+    def authorDisciplineChanged(self, authID, oldDisciplines, newDisciplines):
+        '''
+        Called by the author class whenever the disciplines of the author change, keeps the discipline index and totals updated
+        The whole credit and the type of the author move from the old disciplines to the new ones
+        '''
+        row = self.authorStore.getRow(authID)
+        credit = float(self.authorStore.credit[row])
+        typeID = int(self.authorStore.typeIDs[row])
+        for topicID in oldDisciplines:
+            self.disciplineIndex[topicID].discard(authID)
+            self.updateDisciplineVersion(topicID)
+            if len(self.disciplineIndex[topicID]) == 0:
+                del self.disciplineIndex[topicID]
+                del self.disciplineCredit[topicID]
+                del self.disciplineTypeCounts[topicID]
+            else:
+                self.disciplineCredit[topicID] -= credit
+                self.updateDisciplineTypeCount(topicID, typeID, -1)
+        for topicID in newDisciplines:
+            if topicID not in self.disciplineIndex:
+                self.disciplineIndex[topicID] = set()
+                self.disciplineCredit[topicID] = 0
+                self.disciplineTypeCounts[topicID] = {}
+            self.disciplineIndex[topicID].add(authID)
+            self.updateDisciplineVersion(topicID)
+            self.disciplineCredit[topicID] += credit
+            self.updateDisciplineTypeCount(topicID, typeID, 1)
+
+    def authorCreditChanged(self, authID, creditChange):
+        '''
+        Called by the author class whenever the credit of the author changes, adds the change to the credit of its disciplines
+        '''
+        for topicID in self.getAuthorDiscipline(authID):
+            self.disciplineCredit[topicID] += creditChange
+
+    def authorTypeChanged(self, authID, oldType, newType):
+        '''
+        Called by the author class whenever the type of the author is set, moves the author between the type counts of its disciplines
+        '''
+        for topicID in self.getAuthorDiscipline(authID):
+            if oldType is not None:
+                self.updateDisciplineTypeCount(topicID, oldType.id, -1)
+            self.updateDisciplineTypeCount(topicID, newType.id, 1)
+
+    def updateDisciplineTypeCount(self, topicID, typeID, change):
+        '''
+        Authors without a type (typeID -1) are not counted
+        '''
+        if typeID < 0:
+            return
+        typeCounts = self.disciplineTypeCounts[topicID]
+        if typeID not in typeCounts:
+            typeCounts[typeID] = 0
+        typeCounts[typeID] += change
+        if typeCounts[typeID] == 0:
+            del typeCounts[typeID]
+
+    def updateDisciplineVersion(self, topicID):
+        '''
+        Versions are never reset, so that a rejected split is not reused for a discipline that was emptied and filled again
+        '''
+        if topicID not in self.disciplineVersions:
+            self.disciplineVersions[topicID] = 0
+        self.disciplineVersions[topicID] += 1
+
+    '''Split and Merge Methods'''
+    def setSplitMethod(self, splitMethod):
+        if splitMethod not in SPLIT_METHODS:
+            raise ValueError(f'Unknown splitMethod {splitMethod!r}, expected one of {list(SPLIT_METHODS)}')
+        self.splitMethod = splitMethod
+
+    def spectralSplitCommunity(self, authors):
+        '''
+        Same split as splitCommunity without igraph, the leading eigenvector of the modularity matrix is found with numpy or scipy on the community edges
+        The split is accepted with the same rule: there must be exactly two clusters and the modularity must not decrease
+            Without edges the clusters are the single authors and the modularity is NaN, which fails every comparison
+            So, as with igraph, a community of two authors without an edge between them is split and larger ones are not
+        Returns a list of authors in the new community if community is split, False otherwise
+        '''
+        vertexAuthors, edges = self.getInducedEdges(authors)
+        numVertices = len(vertexAuthors)
+        if numVertices == 0:
+            return False
+        membership = leadingEigenvectorClusters(numVertices, edges)
+
+        # compare unweighted modularity of new communities to the initial, where every author is in their own community
+        if membership.max() != 1 or partitionModularity(numVertices, edges, np.arange(numVertices)) > partitionModularity(numVertices, edges, membership):
+            return False
+
+        # choose new cluster as the smaller one
+        clusters = [np.flatnonzero(membership == 0), np.flatnonzero(membership == 1)]
+        index = 1 if len(clusters[1]) < len(clusters[0]) else 0
+        return [vertexAuthors[vertex] for vertex in clusters[index].tolist()]
+
+    def splitDiscipline(self, topicID):
+        '''
+        Function will try to split the authors of the discipline with splitCommunity
+        A rejected split is remembered with the version of the discipline, so it is not attempted again until the discipline changes
+        Returns a list of authors in the new community if community is split, False otherwise
+        '''
+        version = self.disciplineVersions.get(topicID, 0)
+        if self.rejectedSplits.get(topicID) == version:
+            return False
+
+        communityAuthors = self.getDisciplineAuthors(topicID)
+        if self.splitMethod == 'spectral':
+            newCommunity = self.spectralSplitCommunity(communityAuthors)
+        else:
+            newCommunity = self.splitCommunity(communityAuthors)
+        if not newCommunity:
+            self.rejectedSplits[topicID] = version
+        return newCommunity
+
+    def isMergeModular(self, com1Only, com2, com2Edges):
+        '''
+        Function will compare the unweighted modularity of the merged community to the two separate communities, on the subgraph of both communities
+        Arguments:
+            com1Only: set of the authors of the first community that are not in the second
+            com2: set of the authors of the second community
+            com2Edges: number of edges between the authors of the second community
+        The merged community is the whole subgraph, so its modularity is 0 if the subgraph has edges and undefined otherwise
+        The modularity of the two communities only needs the edges inside the first community and the edges between them, found from the neighbors of com1Only
+        Returns True if the merged modularity is at least that of the separate communities, False otherwise or if there are no edges
+        '''
+        # each edge inside the first community is seen from both authors
+        com1Ends = 0
+        cutEdges = 0
+        for authID in com1Only:
+            for neighbor, weight in self.getNeighborWeights(authID):
+                if neighbor in com1Only:
+                    com1Ends += 1
+                elif neighbor in com2:
+                    cutEdges += 1
+        internalEdges = [com1Ends // 2, com2Edges]
+
+        numEdges = internalEdges[0] + internalEdges[1] + cutEdges
+        if numEdges == 0:
+            return False
+        mergedMod = 0
+
+        # the degree sum of each community in the subgraph counts the internal edges twice and the cut edges once
+        degreeSums = [2 * internalEdges[0] + cutEdges, 2 * internalEdges[1] + cutEdges]
+        unMergedMod = sum(internalEdges[com] / numEdges - (degreeSums[com] / (2 * numEdges)) ** 2 for com in (0, 1))
+
+        return mergedMod >= unMergedMod
+
+    def mergeCommunities(self, com1=[], com2=[]):
+        '''
+        Function will take the two communities as a list of authorIDs
+        Will check modularity and merge them, authors that are in both communities will be a part of the second
+        Returns list of authors in merged community if merged, False otherwise
+        '''
+        com2Set = set(com2)
+        com1Only = set(com1) - com2Set
+        com2Edges = sum(self.countNeighborsIn(authID, com2Set) for authID in com2Set) // 2
+        if not self.isMergeModular(com1Only, com2Set, com2Edges):
+            return False
+        return list(set(com1 + com2))
+
+    def mergeTopics(self, topic1, topic2):
+        '''
+        Same check as mergeCommunities on the authors with each topic, using the maintained internal edges of the second topic
+        Only the authors with topic1 and not topic2 are visited
+        Returns True if the topics should be merged, False otherwise
+        '''
+        com2 = self.topicIndex.get(topic2, set())
+        com1Only = {authID for authID in self.topicIndex.get(topic1, ()) if authID not in com2}
+        return self.isMergeModular(com1Only, com2, self.topicInternalEdges.get(topic2, 0))
+
+    '''Print Methods'''
+    def printAuthor(self, authID):
+        '''Function will print the data associated with the author'''
+        # print papers
+        print(self.getAuthorClass(authID).getAuthorPapersStr())
+
+        # print neighbors
+        formattedData = [[x, weight] for x, weight in self.getNeighborWeights(authID)]
+        dfNeighbors = pd.DataFrame(data=formattedData, columns=["Neighbor", "Weight"])
+        print(dfNeighbors.to_string(index=False))
+
+    def getAuthorDiscipline(self, authID):
+        '''
+        Function returns a list containing the discipline(s) of the author
+        For each author, the topic that contains the most papers would be their assigned discipline
+            If there is a tie, then the function returns all discipline IDs
+        '''
+        return self.getAuthorClass(authID).getAuthorDiscipline()
+
+    def updateAuthorPapers(self, authors, topics, paperID):
+        '''
+        Function will update the topics and papers of all authors
+        '''
+        for authID in authors:
+            self.getAuthorClass(authID).insertPaper(paperID, topics)
+
+    def updateAuthorPapersAndCredit(self, authors, topics, paperID, useReputation):
+        '''
+        Function will update the topics and papers of all authors, updating their credit for the paper and the paper itself
+        It will either use reputation or not.
+        The credit of all authors is computed in one step on the author store, from the scalar of their types
+        '''
+        rows = self.authorStore.getRows(authors)
+
+        # base credit is either the sqrt of authors credit or a constant
+        baseCredit = math.sqrt(self.authorStore.credit[rows].sum()) if useReputation else 1
+
+        # distribute the credit by type to the authors, adding the total of each type at once
+        amounts, typeTotals = self.authorStore.addPaperCredit(rows, baseCredit)
+        for typeID in np.flatnonzero(typeTotals).tolist():
+            self.authorStore.types[typeID].addCredit(float(typeTotals[typeID]))
+
+        # the credit is added to the current disciplines, inserting the paper then moves the whole credit if they change
+        for authID, amountCredit in zip(authors, amounts.tolist()):
+            authorClass = self.getAuthorClass(authID)
+            self.authorCreditChanged(authID, amountCredit)
+            authorClass.insertPaper(paperID, topics)
+            authorClass.setPaperCredit(paperID, amountCredit)
+
+    def determinePaperTopic(self, authors):
+        '''
+        Returns the list, containing the paper topic(s)
+        Function will loop through all the authors, getting their disciplines
+            If this is a tie, then the paper is added to both disciplines
+                This is not a strict rule and could be modified
+        '''
+        # count all the author disciplines, put them in topics
+        topics = {}
+        for authID in authors:
+            for top in self.getAuthorDiscipline(authID):
+                if top not in topics:
+                    topics[top] = 0
+                topics[top] += 1
+
+        # get the topics with the maximum value, append them to the paper topics
+        paperTopics = []
+        maxVal = 0
+        for id, num in topics.items():
+            if num == maxVal:
+                paperTopics.append(id)
+            elif num > maxVal:
+                maxVal = num
+                paperTopics = [id]
+
+        # returns the topic that represents the disciplines that most authors are in
+        return paperTopics
+
+    def creditWalk(self, authors, probStop, newPaperID, maxAge, useReputation):
+        '''
+        Function that takes the current list of authors and probStop as input
+        Returns paper tuple with (topicID, [authors])
+        Will walk based on the credit accumulation of the authors
+        '''
+        return self.coauthorWalk(authors, probStop, newPaperID, maxAge, modelType=3 if useReputation else 2)
+    
+    def biasedRandomWalk(self, authors, probStop, newPaperID, maxAge, includeCredit):
+        '''
+        Function that takes the current list of authors and probStop as input
+        Returns paper tuple with (topicID, [authors])
+        '''
+        return self.coauthorWalk(authors, probStop, newPaperID, maxAge, modelType=1 if includeCredit else 0)
+
+    def coauthorWalk(self, authors, probStop, newPaperID, maxAge, modelType):
+        '''
+        Function will walk from the last author in authors, adding coauthors until probStop is hit or there are no new neighbors to traverse
+        Returns paper tuple with (topicID, [authors])
+        modelType:
+            0: walk on the edge weights, without any credit accumulation
+            1: walk on the edge weights, with credit accumulation
+            2: walk on the edge weights and the reputation of the neighbors, with credit accumulation
+            3: same walk as 2, paper credit is a function of the authors' reputation
+        '''
+        # only the authors that are below the max age are active and can be walked to
+        self.retireAuthors(newPaperID, maxAge)
+        visited = set(authors)
+        while True:
+            currAuthorID = authors[-1]
+
+            # stop at node if probStop hit or there are no new neighbors to traverse
+            if random.random() < probStop:
+                break
+            if modelType >= 2:
+                # the new and active neighboring nodes of the current coauthor
+                neighbors = []
+                edgeWeights = []
+                for neighbor, weight in self.getNeighborWeights(currAuthorID):
+                    if neighbor not in visited and neighbor in self.activeAuthors:
+                        neighbors.append(neighbor)
+                        edgeWeights.append(weight)
+                # probability of traversing to a node is based on previous coauthorship and the cached log of the reputation
+                weights = self.authorStore.getWalkWeights(neighbors, edgeWeights)
+                coauthorID = weightedChoice(neighbors, weights)
+            else:
+                # select next coauthor from the active neighbors, proportional to the edge weights
+                coauthorID = self.sampler.sample(self, currAuthorID, exclude=authors)
+            if coauthorID is None:
+                break
+
+            # update all edges of coauthors to this new author
+            self.incrementCoauthorEdges(authors, coauthorID)
+            authors.append(coauthorID)
+            visited.add(coauthorID)
+
+        # determine the paper topic
+        topics = self.determinePaperTopic(authors)
+        # update the papers for all authors
+        if modelType == 0:
+            self.updateAuthorPapers(authors, topics, newPaperID)
+        else:
+            self.updateAuthorPapersAndCredit(authors, topics, newPaperID, useReputation=(modelType == 3))
+
+        return topics, authors
+
+    def getDisciplineAuthors(self, topicID):
+        '''
+        Returns a list of authors who would be in the discipline of the topicID
+        A community is defined as follows: Every author who has a majority of one topic in their papers
+        '''
+        return list(self.disciplineIndex.get(topicID, []))
+
+    def getDisciplineAggregates(self, topicIDs):
+        '''
+        Returns the running totals of the disciplines, without visiting their authors
+            { topicID: {'credit': totalCredit, 'numAuthors': numAuthors, typeName: numAuthors, ...} }
+        Topics without discipline authors are left out
+        '''
+        aggregates = {}
+        for topicID in topicIDs:
+            if topicID not in self.disciplineIndex:
+                continue
+            aggregates[topicID] = {
+                'credit': self.disciplineCredit[topicID],
+                'numAuthors': len(self.disciplineIndex[topicID]),
+            }
+            for typeID, typeClass in self.authorStore.types.items():
+                aggregates[topicID][typeClass.name] = self.disciplineTypeCounts[topicID].get(typeID, 0)
+        return aggregates
+
+    def getAuthorswithTopic(self, topicID):
+        '''
+        Returns a list of authors who would have the given topic
+        '''
+        return list(self.topicIndex.get(topicID, []))
+
+
+    def updatePaperInNetwork(self, paperID, paperData):
+        '''
+        Function will update the author network with the paper, only visiting the authors of the paper
+        PaperID: int
+        paperData: ([oldTopics], [topics], [authors])
+        '''
+        oldTopics, paperTopics, paperAuthors = paperData
+        for authID in paperAuthors:
+            self.getAuthorClass(authID).updateAuthor(paperID, oldTopics, paperTopics)
+
+    def updatePapersInNetwork(self, papers):
+        '''
+        Function will update the author network with many relabelled papers at once, visiting each author once
+        papers: { paperID: ([oldTopics], [topics], [authors]) }
+        '''
+        authorPapers = {}
+        for paperID, (oldTopics, paperTopics, paperAuthors) in papers.items():
+            for authID in paperAuthors:
+                if authID not in authorPapers:
+                    authorPapers[authID] = {}
+                authorPapers[authID][paperID] = (oldTopics, paperTopics)
+
+        for authID, relabelledPapers in authorPapers.items():
+            self.getAuthorClass(authID).updateAuthorPapers(relabelledPapers)
+
+    def genGraphFeatures(self):
+        '''
+        Will return the dictionary for node labels and list of colors for plotting
+        Used for labels and colors in networkx graph drawing: https://networkx.org/documentation/latest/reference/generated/networkx.drawing.nx_pylab.draw_networkx.html?highlight=draw_networkx
+        '''
+        labels = {}
+        colors = []
+        for authID in self.getAuthorIDs():
+            disciplines = self.getAuthorDiscipline(authID)
+            labels[authID] = f'{authID}: ' + ','.join(map(str, disciplines))
+            colors.append(4 * disciplines[0])
+        return labels, colors
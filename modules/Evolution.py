@@ -1,8 +1,9 @@
 from cProfile import label
 from modules.Type import Type
 from .ScholarNetwork import Graph
-from .Paper import Paper
-from .Topic import Topic
+from .ArrayNetwork import ArrayGraph
+from .PaperStore import PaperStore
+from .TopicRegistry import TopicRegistry
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
@@ -11,14 +12,23 @@ import random
 import pickle
 import sys
 
+# network classes of the networkBackend argument
+NETWORK_BACKENDS = {'networkx': Graph, 'array': ArrayGraph}
+
 class Evolution:
 
-    def __init__(self, Pn=0.6, Pw=0.3, Pd=0.5, maxAge=1000):
+    def __init__(self, Pn=0.6, Pw=0.3, Pd=0.5, maxAge=1000, networkBackend='networkx', splitMethod='igraph'):
         '''
         The probabilities are as follows:
             Pn: probability of a new author being added to a network at a time step (used in evolve)
             Pw: probability that a random walk will stop at a given node (used in random walk)
             Pd: probability that a split and merge event will occur
+        networkBackend determines how the scholar network is stored:
+            'networkx': Graph class, extending networkx.Graph
+            'array': ArrayGraph class, storing the network in integer indexed arrays
+        splitMethod determines how disciplines are split:
+            'igraph': leading eigenvector method of igraph
+            'spectral': the same method computed with numpy and scipy on the community edges, without igraph
         '''
         '''Define Probabilites'''
         # probability that you generate new author
@@ -29,10 +39,18 @@ class Evolution:
         self.probEvent = Pd
         
         '''Data Structures'''
-        self.network = Graph()
-        self.papers = {}
-        self.topics = {}
+        if networkBackend not in NETWORK_BACKENDS:
+            raise ValueError(f'Unknown networkBackend {networkBackend!r}, expected one of {list(NETWORK_BACKENDS)}')
+        self.network = NETWORK_BACKENDS[networkBackend]()
+        self.network.setSplitMethod(splitMethod)
+        # authors and topics of all papers, can be read like a { paperID: Paper } dict
+        self.papers = PaperStore()
+        # live topics are kept in the registry, self.topics is its { topicID: Topic } dict
+        self.topicRegistry = TopicRegistry()
+        self.topics = self.topicRegistry.getTopics()
         self.types = {}
+        # papers where half the number of authors rounds down to zero, so they meet the majority check of every new community
+        self.singleAuthorPapers = []
 
         '''Inital Parameters'''
         self.newAuthor = 1
@@ -44,8 +62,9 @@ class Evolution:
         # add author, adding it to type
         self.network.addAuthor(self.newAuthor, birthIteration=self.newAuthor, initialData={initialTopic: [self.newPaper]})
         self.addAuthortoType(self.newAuthor)
-        self.papers[self.newPaper] = Paper(self.newPaper, topics=[initialTopic], authors=[self.newAuthor])
-        self.topics[initialTopic] = Topic(initialTopic, papers=[self.newPaper])
+        self.papers.addPaper(self.newPaper, topics=[initialTopic], authors=[self.newAuthor])
+        self.singleAuthorPapers.append(self.newPaper)
+        self.topicRegistry.addTopic(initialTopic, papers=[self.newPaper])
         self.newAuthor += 1
         self.newPaper += 1
 
@@ -63,10 +82,10 @@ class Evolution:
         return self.network.getAuthorIDs()
 
     def getNumTopics(self):
-        return len(self.topics.keys())
+        return self.topicRegistry.getNumTopics()
 
     def getNumPapers(self):
-        return len(self.papers.keys())
+        return self.papers.getNumPapers()
 
     def getNumAuthors(self):
         return len(self.getAuthorIDs())
@@ -104,13 +123,12 @@ class Evolution:
                 'Dp': []
             }
         # get paper parameters distribution
-        for paper in self.papers.values():
-            descr['Ap'].append(paper.getNumAuthors())
-            descr['Dp'].append(paper.getNumTopics())
+        descr['Ap'].extend(self.papers.getAuthorsPerPaper().tolist())
+        descr['Dp'].extend(self.papers.getTopicsPerPaper().tolist())
 
         # get author distributions
+        descr['Pa'].extend(self.network.getAuthorStore().getNumPapers().tolist())
         for authID, authClass in self.network.getNetworkData():
-            descr['Pa'].append(authClass.getNumPapers())
             disciplines = authClass.getAuthorDiscipline()
             descr['Da'].append(len(disciplines))
             # update disciplines for discipline parameters
@@ -126,17 +144,18 @@ class Evolution:
         return descr
 
     def getDegreeDistribution(self):
-        return sorted((d for n, d in self.network.degree()), reverse=True)
+        return sorted(self.network.getDegrees(), reverse=True)
 
     def getCreditDistribution(self):
         '''
         Returns a dict of { typeKey: [authCredit, authCredit]}
         '''
+        store = self.network.getAuthorStore()
+        credits = store.getCredits()
+        typeIDs = store.getTypeIDs()
         creditDistr = {}
         for typeClass in self.types.values():
-            creditDistr[typeClass.name] = []
-            for authID in typeClass.getAuthors():
-                creditDistr[typeClass.name].append(self.network.getAuthorClass(authID).getCredit())
+            creditDistr[typeClass.name] = credits[typeIDs == typeClass.id].tolist()
         return creditDistr
 
     def getDisciplineTypeDistribution(self):
@@ -146,19 +165,32 @@ class Evolution:
             { disiplineKey: [authType, authType] } 
             and 
             { disiplineKey: [authCredit, authCredit] } 
-            
+            The authors are read from the discipline index, so getQuantDistr does not need to be called first
         '''
+        store = self.network.getAuthorStore()
+        typeNames = {typeID: typeClass.name for typeID, typeClass in store.types.items()}
         types = {}
         credits = {}
-        for id, discipline in self.topics.items():
-            types[id] = []
-            credits[id] = []
-            for authorClass in discipline.getAuthors():
-                types[id].append(authorClass.getType().name)
-                credits[id].append(authorClass.getCredit())
+        for id in self.topics.keys():
+            rows = store.getRows(self.network.getDisciplineAuthors(id))
+            types[id] = [typeNames.get(typeID) for typeID in store.typeIDs[rows].tolist()]
+            credits[id] = store.credit[rows].tolist()
         print(f'Num topics: {len(self.topics.keys())}')
         return types, credits
 
+    def getCreditTypeDistribution(self, typeName='Marginalized'):
+        '''
+        Returns the data of the credit and type plot, with one value per discipline:
+            [[fraction of typeName authors], [average credit per author], [number of authors]]
+        The totals of each discipline are kept by the network, so the authors are not visited
+        Types that no author has been given yet have no count, their fraction is 0
+        '''
+        aggregates = self.network.getDisciplineAggregates(self.topics.keys())
+        xVals = [x.get(typeName, 0)/x['numAuthors'] for x in aggregates.values()]
+        yVals = [x['credit']/x['numAuthors'] for x in aggregates.values()]
+        disciplineSizes = [x['numAuthors'] for x in aggregates.values()]
+        return [xVals, yVals, disciplineSizes]
+
     def updateDisciplineAuthors(self, authorClass, disciplines):
         for discID in disciplines:
             if discID in self.topics:
@@ -183,65 +215,82 @@ class Evolution:
         Will update the topics, papers, and authors
         '''
         # set variables
-        newTopic = max(self.topics.keys()) + 1
+        newTopic = self.topicRegistry.newTopicID()
         comAuthorsSet = set(communityAuthors)
+        relabelledPapers = {}
 
-        # loop through all the papers, checking to see the field of majority of their authors
-        for paperID, paperClass in self.papers.items():
+        # only papers of the community authors can have a majority in the new community, apart from the single author papers
+        candidatePapers = set(self.singleAuthorPapers)
+        for authID in communityAuthors:
+            for papers in self.network.getAuthorData(authID).values():
+                candidatePapers.update(papers)
+
+        # loop through the candidate papers in order, checking to see the field of majority of their authors
+        for paperID in sorted(candidatePapers):
+            paperAuthors = self.papers.getPaperAuthors(paperID)
 
             # get intersection, check to see if majority of authors in new community
-            intersectionAuths = comAuthorsSet.intersection(set(paperClass.getAuthors()))
+            intersectionAuths = comAuthorsSet.intersection(paperAuthors)
 
             # relabel papers if in new topic
             numIntersectAuths = len(intersectionAuths)
-            numHalfAuths = len(paperClass.getAuthors()) // 2
+            numHalfAuths = len(paperAuthors) // 2
             if numIntersectAuths >= numHalfAuths:
-                paperClass.addTopic(newTopic)
+                oldTopics = self.papers.getPaperTopics(paperID)
+                self.papers.addTopic(paperID, newTopic)
 
                 # add to topics 
                 if newTopic not in self.topics:
-                    self.topics[newTopic] = Topic(newTopic)
+                    self.topicRegistry.addTopic(newTopic)
                 self.topics[newTopic].addPaper(paperID)
 
                 # remove paper from old topics if strictly in new topic
                 if numIntersectAuths > numHalfAuths:
-                    # update topics data structure
-                    for oldTopic in paperClass.getTopics():
-                        if paperID in self.topics[oldTopic].getPapers():
+                    # update topics data structure, retiring the old topics that no longer have papers
+                    for oldTopic in self.papers.getPaperTopics(paperID):
+                        if self.topics[oldTopic].hasPaper(paperID):
                             self.topics[oldTopic].removePaper(paperID)
-                    # update papers data structure
-                    paperClass.clearTopics()
+                            if oldTopic != newTopic:
+                                self.topicRegistry.retireIfEmpty(oldTopic)
+                    # update papers data structure, relabelling the topics of the paper in place
                     self.topics[newTopic].addPaper(paperID)
-                    paperClass.addTopic(newTopic)
+                    self.papers.setTopics(paperID, [newTopic])
 
-                # update authors in network with papers
-                self.network.updatePaperInNetwork(paperID, (paperClass.getTopics(), paperClass.getAuthors()))
+                relabelledPapers[paperID] = (oldTopics, self.papers.getPaperTopics(paperID), paperAuthors)
 
-    def randomNeighboringCommunities(self):
+        # update authors in network with papers
+        self.network.updatePapersInNetwork(relabelledPapers)
+
+    def randomNeighboringTopics(self):
         '''
-        Function used to get two random neighboring communities for merge event
-        Returns a tuple of the two communities or None if network not big enough
-            ([authorIDs in community 1], [authorIDs in community 2])
+        Function used to get two random neighboring topics for merge event
+        Returns a tuple of the two topicIDs or None if network not big enough
         '''
 
         # choose random author with at least two papers in different topics. 
-        allAuthors = self.getAuthorIDs()
-        while len(allAuthors) > 0:
-            authID = random.choice(allAuthors)
-            allAuthors.remove(authID)
-            authData = self.network.getAuthorData(authID)
-            if len(authData.keys()) > 1:
-                break
-            authID = None
+        authID = self.network.randomMultiTopicAuthor()
 
         # select two random topics from author
         if not authID:
             return None
+        authData = self.network.getAuthorData(authID)
         allTopics = list(authData.keys())
         top1 = random.choice(allTopics)
         allTopics.remove(top1)
         top2 = random.choice(allTopics)
 
+        return top1, top2
+
+    def randomNeighboringCommunities(self):
+        '''
+        Function used to get two random neighboring communities for merge event
+        Returns a tuple of the two communities or None if network not big enough
+            ([authorIDs in community 1], [authorIDs in community 2])
+        '''
+        topics = self.randomNeighboringTopics()
+        if not topics:
+            return None
+        top1, top2 = topics
 
         # print(f'Random author {authID} with Topic {top1} with authors {self.network.getAuthorswithTopic(top1)}, Topic {top2} with authors {self.network.getAuthorswithTopic(top2)}')
 
@@ -259,25 +308,32 @@ class Evolution:
         return typeID
 
     def updateMergedCommunities(self, d1, d2):
-        # add papers to new discipline without getting rid of old disciplines
-        newTopic = max(self.topics.keys()) + 1
-        if d1 in self.topics:
-            for paperID in self.topics[d1].getPapers():
-                paperClass = self.papers[paperID]
-                if d1 in paperClass.getTopics():
-                    paperClass.getTopics().remove(d1)
-                paperClass.getTopics().append(newTopic)
-                self.network.updatePaperInNetwork(paperID, (paperClass.getTopics(), paperClass.getAuthors()))
-        
-        if d2 in self.topics:
-            for paperID in self.topics[d2].getPapers():
-                paperClass = self.papers[paperID]
-                if d2 in paperClass.getTopics():
-                    paperClass.getTopics().remove(d2)
-                paperClass.getTopics().append(newTopic)
-                self.network.updatePaperInNetwork(paperID, (paperClass.getTopics(), paperClass.getAuthors()))
-
-        return
+        '''
+        Function will move the papers of both disciplines to a new topic, keeping the other topics of the papers
+        The merged disciplines no longer have papers, so they are retired
+        '''
+        newTopic = self.topicRegistry.newTopicID()
+        mergedTopic = self.topicRegistry.addTopic(newTopic)
+        # topics of the papers before the merge, a paper in both disciplines is relabelled twice
+        oldPaperTopics = {}
+        for oldTopic in (d1, d2):
+            if oldTopic not in self.topics:
+                continue
+            for paperID in self.topics[oldTopic].getPapers():
+                if paperID not in oldPaperTopics:
+                    oldPaperTopics[paperID] = self.papers.getPaperTopics(paperID)
+                self.papers.removeTopic(paperID, oldTopic)
+                # papers in both disciplines only get the new topic once
+                self.papers.addTopic(paperID, newTopic)
+                mergedTopic.addPaper(paperID)
+            self.topicRegistry.retireTopic(oldTopic)
+        self.topicRegistry.retireIfEmpty(newTopic)
+
+        relabelledPapers = {paperID: (oldTopics, self.papers.getPaperTopics(paperID), self.papers.getPaperAuthors(paperID))
+                            for paperID, oldTopics in oldPaperTopics.items()}
+
+        # update authors in network with papers
+        self.network.updatePapersInNetwork(relabelledPapers)
 
     def evolve(self, modelType= 0 | 1 | 2 | 3, newPapers=None, newAuthors=None):
         '''
@@ -303,9 +359,9 @@ class Evolution:
         increments = (increments - 1) if ind <= 2 else increments
 
         while ind < increments:
-            # Randomly select author from network, will be used as first author or first coauthor
-            currNodes = list(self.network.nodes())
-            authors = [random.choice(currNodes)]
+            # Randomly select active author from network, will be used as first author or first coauthor
+            self.network.retireAuthors(self.newPaper, self.maxAge)
+            authors = [self.network.randomAuthor(activeOnly=True)]
 
             # with probability, add new author to network set as main author with the coauthor
             if random.random() < self.probNewAuthor:
@@ -313,45 +369,38 @@ class Evolution:
                 authors.insert(0, self.newAuthor)
                 # add node without data, disciplines will be added after paper is completed
                 self.network.addAuthor(self.newAuthor, birthIteration=self.newPaper, initialData={})
-                self.network.add_edge(self.newAuthor, authors[1], weight=1, width=1)
+                self.network.incrementCoauthorEdges([self.newAuthor], authors[1])
                 # NOTE: add author to type, must be edited out for original model
                 self.addAuthortoType(self.newAuthor)
                 # increment new authorID
                 self.newAuthor += 1
 
             # Add new paper, calling function
-            if (modelType == 0):
-                paperTopics, paperAuthors = self.network.biasedRandomWalk(authors, self.probStop, self.newPaper, self.maxAge, includeCredit=False)
-            elif (modelType == 1):
-                paperTopics, paperAuthors = self.network.biasedRandomWalk(authors, self.probStop, self.newPaper, self.maxAge, includeCredit=True)
-            elif (modelType == 2):
-                paperTopics, paperAuthors = self.network.creditWalk(authors, self.probStop, self.newPaper, maxAge=self.maxAge, useReputation=False)
-            elif (modelType == 3):
-                paperTopics, paperAuthors = self.network.creditWalk(authors, self.probStop, self.newPaper, maxAge=self.maxAge, useReputation=True)
-            self.papers[self.newPaper] = Paper(self.newPaper, topics=paperTopics, authors=paperAuthors)
+            paperTopics, paperAuthors = self.network.coauthorWalk(authors, self.probStop, self.newPaper, self.maxAge, modelType=modelType)
+            self.papers.addPaper(self.newPaper, topics=paperTopics, authors=paperAuthors)
+            if self.papers.getPaperNumAuthors(self.newPaper) // 2 == 0:
+                self.singleAuthorPapers.append(self.newPaper)
 
             # add paper to corresponding topics
             for topicID in paperTopics:
                 if topicID not in self.topics:
-                    self.topics[topicID] = Topic(topicID)
+                    self.topicRegistry.addTopic(topicID)
                 self.topics[topicID].addPaper(self.newPaper)
 
             # split random discipline with prob pd
             if random.random() < self.probEvent:
-                communityAuthors = self.network.getDisciplineAuthors(random.choice(list(self.topics.keys())))
-                newCommunity = self.network.splitCommunity(communityAuthors)
+                newCommunity = self.network.splitDiscipline(self.topicRegistry.randomTopic())
                 # update the papers, topics, and authors
                 if newCommunity:
                     self.updateNewCommunity(newCommunity)
 
             # merge random discipline with prob pm
             if random.random() < self.probEvent:
-                disciplinesObj = self.randomNeighboringCommunities()
-                if disciplinesObj:
-                    newCom = self.network.mergeCommunities(com1=disciplinesObj[0], com2=disciplinesObj[1])
-                    if newCom:
-                        # self.updateNewCommunity(newCom)
-                        self.updateMergedCommunities(disciplinesObj[2], disciplinesObj[3])
+                topics = self.randomNeighboringTopics()
+                # check the modularity of the merge from the maintained topic edges, without listing the authors of both topics
+                if topics and self.network.mergeTopics(topics[0], topics[1]):
+                    # self.updateNewCommunity(newCom)
+                    self.updateMergedCommunities(topics[0], topics[1])
 
             # increment papers, update ind
             self.newPaper += 1
@@ -604,30 +653,12 @@ class Evolution:
         Plot will have the average credit per author on Y-Axis, % type 0 in discipline. Each data point will be a discipline
         distrib = [xVals, yVals]
         '''
-        allDisciplines = {}
-        for topic in self.topics.keys():
-            # initialized data
-            for authID in self.network.getDisciplineAuthors(topic):
-                if topic not in allDisciplines:
-                    allDisciplines[topic] = {
-                        'credit': 0,
-                        'numAuthors': 0,
-                        'Marginalized': 0,
-                        'Dominant': 0,
-                    }
-                authClass = self.network.getAuthorClass(authID)
-                allDisciplines[topic]['credit'] += authClass.getCredit()
-                allDisciplines[topic]['numAuthors'] += 1
-                allDisciplines[topic][authClass.getType().name] += 1
-
         # add plot
         fig = plt.figure(figsize=(9, 7))
         axis = fig.add_subplot()
 
         typeName = 'Marginalized'
-        xVals = [x[typeName]/x['numAuthors'] for x in allDisciplines.values()] if not distrib else distrib[0]
-        yVals = [x['credit']/x['numAuthors'] for x in allDisciplines.values()] if not distrib else distrib[1]
-        disciplineSizes = [x["numAuthors"] for x in allDisciplines.values()] if not distrib else distrib[2]
+        xVals, yVals, disciplineSizes = self.getCreditTypeDistribution(typeName) if not distrib else distrib
         axis.scatter(xVals, yVals)
 
         # sns.regplot(x=xVals, y=yVals, scatter=True, order=2)
@@ -638,18 +669,24 @@ class Evolution:
         axis.set_title(f'''Credit and Type Distribution throughout Disciplines''')
         fig.tight_layout()
 
+        # regression lines need more distinct x values than their degree, e.g. early in a run there may be one discipline
+        numDistinctX = len(set(xVals))
+
         # obtain m (slope) and b(intercept) of linear regression line
-        m, b = np.polyfit(xVals, yVals, 1)
-        # use red as color for regression line
-        axis.plot(xVals, [m*x+b for x in xVals], color='red', label=f'y={round(m)}x + {round(b)}')
+        if numDistinctX > 1:
+            m, b = np.polyfit(xVals, yVals, 1)
+            # use red as color for regression line
+            axis.plot(xVals, [m*x+b for x in xVals], color='red', label=f'y={round(m)}x + {round(b)}')
 
         # obtain regression line of degree 2
-        a, m, b = np.polyfit(xVals, yVals, 2)
-        # use red as color for regression line
-        sortedX = sorted(xVals)
-        axis.plot(sortedX, [a*(x**2) + m*x + b for x in sortedX], color='green', label=f'y={round(a)}x^2 + {round(m)}x + {round(b)}')
-
-        axis.legend()
+        if numDistinctX > 2:
+            a, m, b = np.polyfit(xVals, yVals, 2)
+            # use red as color for regression line
+            sortedX = sorted(xVals)
+            axis.plot(sortedX, [a*(x**2) + m*x + b for x in sortedX], color='green', label=f'y={round(a)}x^2 + {round(m)}x + {round(b)}')
+
+        if numDistinctX > 1:
+            axis.legend()
         
         if saveToFile:
             fig.savefig(saveToFile)
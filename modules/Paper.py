@@ -2,6 +2,9 @@ class Paper:
     '''
     Class defines the papers and their corresponding methods
     '''
+    # slots instead of a per instance dict, there is one instance for every paper in the model
+    __slots__ = ('id', 'topics', 'authors')
+
     def __init__(self, id, topics=[], authors=[]):
 
         self.id = id
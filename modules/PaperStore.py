@@ -0,0 +1,196 @@
+import numpy as np
+from .Paper import Paper
+from .ArrayUtils import growArray
+
+class PaperStore:
+    '''
+    Class stores the authors and topics of all papers in flat integer arrays, indexed by the row of the paper
+        Authors: offsets plus flat author IDs (CSR), the authors of a paper never change
+        Topics: start, count and capacity of each paper in the flat topic IDs, so that topics can be relabelled in place
+            A paper whose topics outgrow their capacity is moved to the end of the flat topic IDs, leaving its old region unused
+            The flat topic IDs are compacted once their unused slots outnumber the topics of the papers
+    Paper classes are only created as copies for reading, e.g. with store[paperID]
+    '''
+    def __init__(self, initialCapacity=16):
+        # { paperID: row }
+        self.rows = {}
+        self.size = 0
+        self.ids = np.zeros(initialCapacity, dtype=np.int64)
+
+        # authors of row i are authorIDs[authorOffsets[i]:authorOffsets[i + 1]]
+        self.authorOffsets = np.zeros(initialCapacity + 1, dtype=np.int64)
+        self.authorIDs = np.zeros(2 * initialCapacity, dtype=np.int64)
+
+        # topics of row i are topicIDs[topicStarts[i]:topicStarts[i] + topicCounts[i]]
+        self.topicStarts = np.zeros(initialCapacity, dtype=np.int64)
+        self.topicCounts = np.zeros(initialCapacity, dtype=np.int64)
+        self.topicCapacities = np.zeros(initialCapacity, dtype=np.int64)
+        self.topicIDs = np.zeros(2 * initialCapacity, dtype=np.int64)
+        self.topicsSize = 0
+        # number of topics of all papers, the other slots of topicIDs[:topicsSize] are unused
+        self.usedTopics = 0
+
+    '''Add Methods'''
+    def addPaper(self, paperID, topics=[], authors=[]):
+        '''
+        Adds the paper, duplicate topics and authors are removed in the same way as the Paper class
+        '''
+        topics = list(set(topics))
+        authors = list(set(authors))
+        row = self.size
+        self.rows[paperID] = row
+        self.size += 1
+
+        self.ids = growArray(self.ids, self.size)
+        self.ids[row] = paperID
+
+        self.authorOffsets = growArray(self.authorOffsets, self.size + 1)
+        start = self.authorOffsets[row]
+        self.authorIDs = growArray(self.authorIDs, start + len(authors))
+        self.authorIDs[start:start + len(authors)] = authors
+        self.authorOffsets[row + 1] = start + len(authors)
+
+        self.topicStarts = growArray(self.topicStarts, self.size)
+        self.topicCounts = growArray(self.topicCounts, self.size)
+        self.topicCapacities = growArray(self.topicCapacities, self.size)
+        self.allocateTopics(row, max(len(topics), 1))
+        self.writeTopics(row, topics)
+
+    def allocateTopics(self, row, capacity):
+        '''
+        Gives the row a new region of the flat topic IDs at the end, copying its current topics
+        '''
+        if self.topicsSize > 2 * self.usedTopics:
+            self.compactTopics()
+        start = self.topicsSize
+        self.topicIDs = growArray(self.topicIDs, start + capacity)
+        count = self.topicCounts[row]
+        oldStart = self.topicStarts[row]
+        self.topicIDs[start:start + count] = self.topicIDs[oldStart:oldStart + count]
+        self.topicStarts[row] = start
+        self.topicCapacities[row] = capacity
+        self.topicsSize += capacity
+
+    def compactTopics(self):
+        '''
+        Packs the topics of all papers at the start of the flat topic IDs in order of rows, the capacity of each paper becomes its number of topics
+        Takes O(topicsSize) and is only done once the unused slots outnumber the used ones, so the cost per moved paper stays constant
+        '''
+        counts = self.topicCounts[:self.size]
+        newStarts = np.cumsum(counts) - counts
+        # row and position within the row of every topic
+        rows = np.repeat(np.arange(self.size), counts)
+        offsets = np.arange(self.usedTopics) - newStarts[rows]
+
+        newTopicIDs = np.zeros(max(self.usedTopics, 1), dtype=np.int64)
+        newTopicIDs[newStarts[rows] + offsets] = self.topicIDs[self.topicStarts[rows] + offsets]
+        self.topicIDs = newTopicIDs
+        self.topicStarts[:self.size] = newStarts
+        self.topicCapacities[:self.size] = counts
+        self.topicsSize = self.usedTopics
+
+    def writeTopics(self, row, topics):
+        if len(topics) > self.topicCapacities[row]:
+            self.allocateTopics(row, 2 * len(topics))
+        start = self.topicStarts[row]
+        self.topicIDs[start:start + len(topics)] = topics
+        self.usedTopics += len(topics) - int(self.topicCounts[row])
+        self.topicCounts[row] = len(topics)
+
+    '''Relabel Methods'''
+    def setTopics(self, paperID, topics):
+        self.writeTopics(self.rows[paperID], topics)
+
+    def addTopic(self, paperID, topicID):
+        '''
+        Appends the topic to the paper if the paper does not have it
+        '''
+        row = self.rows[paperID]
+        if topicID in self.getRowTopics(row):
+            return
+        count = self.topicCounts[row]
+        if count == self.topicCapacities[row]:
+            self.allocateTopics(row, max(2 * count, 1))
+        self.topicIDs[self.topicStarts[row] + count] = topicID
+        self.topicCounts[row] = count + 1
+        self.usedTopics += 1
+
+    def removeTopic(self, paperID, topicID):
+        '''
+        Removes the topic from the paper if the paper has it, keeping the order of the other topics
+        '''
+        topics = self.getPaperTopics(paperID)
+        if topicID in topics:
+            topics.remove(topicID)
+            self.setTopics(paperID, topics)
+
+    '''Access Methods'''
+    def getRowTopics(self, row):
+        start = self.topicStarts[row]
+        return self.topicIDs[start:start + self.topicCounts[row]]
+
+    def getPaperTopics(self, paperID):
+        return self.getRowTopics(self.rows[paperID]).tolist()
+
+    def getPaperAuthors(self, paperID):
+        row = self.rows[paperID]
+        return self.authorIDs[self.authorOffsets[row]:self.authorOffsets[row + 1]].tolist()
+
+    def getPaperNumAuthors(self, paperID):
+        row = self.rows[paperID]
+        return int(self.authorOffsets[row + 1] - self.authorOffsets[row])
+
+    def getPaperIDs(self):
+        return self.ids[:self.size]
+
+    def getNumPapers(self):
+        return self.size
+
+    def getAuthorsPerPaper(self):
+        '''
+        Returns the number of authors of every paper, in order of insertion
+        '''
+        return np.diff(self.authorOffsets[:self.size + 1])
+
+    def getTopicsPerPaper(self):
+        '''
+        Returns the number of topics of every paper, in order of insertion
+        '''
+        return self.topicCounts[:self.size].copy()
+
+    def getPaper(self, paperID):
+        '''
+        Returns a Paper class with a copy of the topics and authors of the paper, changing it does not change the store
+        '''
+        paper = Paper(paperID)
+        paper.topics = self.getPaperTopics(paperID)
+        paper.authors = self.getPaperAuthors(paperID)
+        return paper
+
+    def getNumBytes(self):
+        '''
+        Returns the number of bytes allocated by the arrays of the store
+        '''
+        return sum(array.nbytes for array in [self.ids, self.authorOffsets, self.authorIDs, self.topicStarts, self.topicCounts, self.topicCapacities, self.topicIDs])
+
+    '''Dict Methods, so that the store can be read like the { paperID: Paper } dict'''
+    def __getitem__(self, paperID):
+        return self.getPaper(paperID)
+
+    def __contains__(self, paperID):
+        return paperID in self.rows
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def keys(self):
+        return self.rows.keys()
+
+    def values(self):
+        return (self.getPaper(paperID) for paperID in self.rows)
+
+    def items(self):
+        return ((paperID, self.getPaper(paperID)) for paperID in self.rows)
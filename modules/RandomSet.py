@@ -0,0 +1,46 @@
+import random
+
+class RandomSet:
+    '''
+    Class defines a set that supports O(1) add, remove, membership and uniform random choice
+    Items are kept in a list, with their positions in the list stored in a dict
+    '''
+    def __init__(self, items=[]):
+        self.items = []
+        self.positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def remove(self, item):
+        '''
+        Removes the item by swapping the last item into its position
+        '''
+        position = self.positions.pop(item)
+        lastItem = self.items.pop()
+        if lastItem != item:
+            self.items[position] = lastItem
+            self.positions[lastItem] = position
+
+    def discard(self, item):
+        if item in self.positions:
+            self.remove(item)
+
+    def choice(self):
+        return random.choice(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __repr__(self):
+        return f'RandomSet({self.items})'
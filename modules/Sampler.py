@@ -0,0 +1,100 @@
+import random
+import numpy as np
+from bisect import bisect_right
+
+def weightedChoice(items, weights):
+    '''
+    Returns an item chosen with probability proportional to its float weight, from a numpy array of weights
+    Uses one random draw and a binary search on the cumulative weights
+    Returns None if there is no item with a positive weight
+    '''
+    if len(items) == 0:
+        return None
+    cumulativeWeights = np.cumsum(weights)
+    total = cumulativeWeights[-1]
+    if total <= 0:
+        return None
+    index = int(np.searchsorted(cumulativeWeights, random.random() * total, side='right'))
+    if index < len(items):
+        return items[index]
+    # floating point rounding, return the last item with a positive weight
+    return items[int(np.flatnonzero(weights > 0)[-1])]
+
+class WeightedSampler:
+    '''
+    Class samples the active neighbors of an author with probability proportional to their edge weights
+    The cumulative weights of each author are cached, so they must be invalidated whenever one of the author's edges changes or a neighbor retires
+    '''
+    def __init__(self):
+        '''
+        Cached tables, stored in the following format:
+            {
+                AuthorID: ([neighborIDs], [cumulativeWeights], { neighborID: position })
+            }
+        '''
+        self.tables = {}
+
+    def invalidate(self, authIDs):
+        for authID in authIDs:
+            self.tables.pop(authID, None)
+
+    def invalidateEdges(self, edges):
+        '''
+        Invalidates the tables of both authors of each (authorID, authorID) edge
+        '''
+        for author1, author2 in edges:
+            self.tables.pop(author1, None)
+            self.tables.pop(author2, None)
+
+    def getTable(self, network, authID):
+        if authID not in self.tables:
+            neighbors = []
+            cumulativeWeights = []
+            positions = {}
+            total = 0
+            for neighbor, weight in network.getNeighborWeights(authID):
+                if neighbor not in network.activeAuthors:
+                    continue
+                positions[neighbor] = len(neighbors)
+                neighbors.append(neighbor)
+                total += weight
+                cumulativeWeights.append(total)
+            self.tables[authID] = (neighbors, cumulativeWeights, positions)
+        return self.tables[authID]
+
+    def sample(self, network, authID, exclude=()):
+        '''
+        Returns a neighbor of the author chosen proportional to the edge weights, skipping the neighbors in exclude
+        Returns None if there are no neighbors left to choose from
+        '''
+        neighbors, cumulativeWeights, positions = self.getTable(network, authID)
+        if len(neighbors) == 0:
+            return None
+
+        # intervals of the excluded neighbors on the cumulative weights
+        excluded = []
+        excludedWeight = 0
+        for neighbor in exclude:
+            if neighbor in positions:
+                index = positions[neighbor]
+                start = cumulativeWeights[index - 1] if index > 0 else 0
+                excluded.append((start, cumulativeWeights[index] - start))
+                excludedWeight += cumulativeWeights[index] - start
+
+        total = cumulativeWeights[-1] - excludedWeight
+        if total <= 0:
+            return None
+
+        # draw from the weight of the remaining neighbors, then shift past the excluded intervals
+        threshold = random.random() * total
+        for start, weight in sorted(excluded):
+            if threshold < start:
+                break
+            threshold += weight
+
+        index = bisect_right(cumulativeWeights, threshold)
+        if index < len(neighbors):
+            return neighbors[index]
+        # floating point rounding, return the last neighbor that is not excluded
+        excludedNeighbors = set(exclude)
+        return next(neighbor for neighbor in reversed(neighbors) if neighbor not in excludedNeighbors)
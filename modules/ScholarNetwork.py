@@ -1,231 +1,133 @@
-import math
 import networkx as nx
-from .Author import Author
-from networkx.algorithms.community import modularity as nx_modularity
-import community
+from .BaseNetwork import BaseNetwork
 from igraph import Graph as modularityGraph
-import random
 import pickle
-import pandas as pd
 from pyvis.network import Network as ntvis
 import matplotlib.pyplot as plt
 from copy import deepcopy
 
 '''
 Inherited Graph class from networkx with methods used for scholar evolution
+The model methods are in BaseNetwork, this class stores the network in the networkx dict of dicts
 Definitions:
     Discipline: defines the top topic of the author, i.e. the topic with the most papers
 '''
-class Graph(nx.Graph):
+class Graph(BaseNetwork, nx.Graph):
 
-    '''Access Methods'''
-    def getNetworkData(self):
-        return self.nodes.data("data")
+    def __init__(self, incoming_graph_data=None, **attr):
+        self.initIndexes()
+        self.initIgraphMirror()
+        super().__init__(incoming_graph_data, **attr)
 
-    def getAuthorIDs(self): 
-        return list(self.nodes)
-
-    def getAuthorPapers(self, authID):
+    def initIgraphMirror(self):
         '''
-        Returns a list of all author papers
+        Unweighted igraph copy of the network used for splitting, with a stable vertex index for each author
+        New authors and edges are queued and added to the mirror in bulk when it is needed
         '''
-        return self.nodes[authID]["data"].getAuthorPapers()
-
-    def getAuthorClass(self, authID):
-        return self.nodes[authID]["data"]
+        self.igraphMirror = modularityGraph()
+        # { authorID: vertex index } and the author of each vertex index
+        self.vertexIndices = {}
+        self.vertexAuthors = []
+        self.pendingVertices = 0
+        self.pendingEdges = []
 
-    def getAuthorData(self, authID):
-        return self.nodes[authID]["data"].getData()
-
-    '''Add Author Method'''
-    def addAuthor(self, authID, birthIteration, initialData={}):
+    def getIgraphMirror(self):
         '''
-        Will add the author with the authID to the network
-        data is the initial data to declare the author with
+        Returns the igraph mirror after adding the queued authors and edges
+        Only the number of authors is checked, in constant time, if the graph was changed without the model methods,
+        e.g. with add_edge, rebuildIgraphMirror must be called
         '''
-        self.add_node(authID, data=Author(authID, birthIteration=birthIteration, initialData=initialData))
-
-    '''Print Methods'''
-    def printAuthor(self, authID):
-        '''Function will print the data associated with the author'''
-        # print papers
-        print(self.nodes[authID]["data"].getAuthorPapersStr())
+        if self.pendingVertices:
+            self.igraphMirror.add_vertices(self.pendingVertices)
+            self.pendingVertices = 0
+        if self.pendingEdges:
+            self.igraphMirror.add_edges(self.pendingEdges)
+            self.pendingEdges = []
 
-        # print neighbors
-        formattedData = [[x, self.get_edge_data(authID, x)["weight"]] for x in self.neighbors(authID)]
-        dfNeighbors = pd.DataFrame(data=formattedData, columns=["Neighbor", "Weight"])
-        print(dfNeighbors.to_string(index=False))
-
-    def getAuthorDiscipline(self, authID):
-        '''
-        Function returns a list containing the discipline(s) of the author
-        For each author, the topic that contains the most papers would be their assigned discipline
-            If there is a tie, then the function returns all discipline IDs
-        '''
-        return self.nodes[authID]["data"].getAuthorDiscipline()
+        if self.igraphMirror.vcount() != self.number_of_nodes():
+            self.rebuildIgraphMirror()
+        return self.igraphMirror
 
-    def updateAuthorPapers(self, authors, topics, paperID):
+    def rebuildIgraphMirror(self):
         '''
-        Function will update the topics and papers of all authors
+        Builds the igraph mirror again from all authors and edges of the graph, in O(N + E)
         '''
-        for authID in authors:
-            self.nodes[authID]["data"].insertPaper(paperID, topics)
+        self.vertexAuthors = list(self.nodes)
+        self.vertexIndices = {authID: index for index, authID in enumerate(self.vertexAuthors)}
+        self.pendingVertices = 0
+        self.pendingEdges = []
+        self.igraphMirror = modularityGraph(n=len(self.vertexAuthors), edges=[(self.vertexIndices[u], self.vertexIndices[v]) for u, v in self.edges()])
 
-    def updateAuthorPapersAndCredit(self, authors, topics, paperID, useReputation):
-        '''
-        Function will update the topics and papers of all authors, updating their credit for the paper and the paper itself
-        It will either use reputation or not.
-        '''
+    '''Access Methods'''
+    def getNetworkData(self):
+        return self.nodes.data("data")
 
-        # base credit is either the sqrt of authors credit or a constant
-        baseCredit = math.sqrt(sum(self.getAuthorClass(authID).getCredit() for authID in authors)) if useReputation else 1
+    def getAuthorIDs(self): 
+        return list(self.nodes)
 
-        for authID in authors:
-            authorClass = self.getAuthorClass(authID)
-            authorClass.insertPaper(paperID, topics)
-            
-            # distribute the credit by type to the authors
-            amountCredit = authorClass.getType().getCreditAmount(baseCredit)
-            authorClass.addCredit(amountCredit, paperID)
+    def getAuthorClass(self, authID):
+        return self.nodes[authID]["data"]
 
-    def determinePaperTopic(self, authors):
-        '''
-        Returns the list, containing the paper topic(s)
-        Function will loop through all the authors, getting their disciplines
-            If this is a tie, then the paper is added to both disciplines
-                This is not a strict rule and could be modified
-        '''
-        # count all the author disciplines, put them in topics
-        topics = {}
-        for authID in authors:
-            for top in self.getAuthorDiscipline(authID):
-                if top not in topics:
-                    topics[top] = 0
-                topics[top] += 1
-
-        # get the topics with the maximum value, append them to the paper topics
-        paperTopics = []
-        maxVal = 0
-        for id, num in topics.items():
-            if num == maxVal:
-                paperTopics.append(id)
-            elif num > maxVal:
-                maxVal = num
-                paperTopics = [id]
-
-        # returns the topic that represents the disciplines that most authors are in
-        return paperTopics
-
-    def creditWalk(self, authors, probStop, newPaperID, maxAge, useReputation):
+    def getDegrees(self):
         '''
-        Recursive function that takes the current list of authors and probStop as input
-        Returns paper tuple with (topicID, [authors])
-        Will walk based on the credit accumulation of the authors
+        Returns a list of the degrees of all authors
         '''
+        return [d for n, d in self.degree()]
 
-        currAuthorID = authors[-1]
-        newNeighbors = set(self.neighbors(currAuthorID)).difference(set(authors))
+    def getDegree(self, authID):
+        return self.degree[authID]
 
-        # create list representing probabilities for the neighboring nodes of the current coauthor
-        probs = []
-        for neighbor in newNeighbors:
-            # check to make sure that author is below the max age
-            if self.getAuthorClass(neighbor).getAge(currentIteration=newPaperID) < maxAge:
-                nData = self.get_edge_data(currAuthorID, neighbor)
-                # calculate the probability of traversing to the certain node is based on previous coauthorship and the log of the reputation
-                probs.extend([neighbor] * round(nData["weight"] * math.log(self.getAuthorClass(neighbor).getReputation())) )
-
-        # base condition: stop at node if probStop hit or there are no new neighbors to traverse
-        if random.random() < probStop or len(probs) == 0:
-            # determine the paper topic
-            topics = self.determinePaperTopic(authors)
-            # update the papers for all authors
-            self.updateAuthorPapersAndCredit(authors, topics, newPaperID, useReputation=useReputation)
-
-            return topics, authors
-
-
-        # Select next coauthor from neighbors probabilities list
-        coauthorID = random.choice(probs)
-
-        # update all edges of coauthors to this new author
-        for author in authors:
-            # if there is not an edge, create one
-            if not self.has_edge(author, coauthorID) and author != coauthorID:
-                self.add_edge(author, coauthorID, weight=0, width=1)
-            
-            newWeight = self.get_edge_data(author, coauthorID)["weight"] + 1
-            self.update(edges=[ (author, coauthorID, {"weight": newWeight}) ])
-
-        # add author to list and call function recursively
-        authors.append(coauthorID)
-        return self.creditWalk(authors, probStop, newPaperID, maxAge, useReputation=useReputation)
-    
-    def biasedRandomWalk(self, authors, probStop, newPaperID, maxAge, includeCredit):
+    def getNeighborWeights(self, authID):
         '''
-        Recursive function that takes the current list of authors and probStop as input
-        Returns paper tuple with (topicID, [authors])
+        Returns an iterator of (neighborID, edgeWeight) for the author
         '''
+        return ((neighbor, data["weight"]) for neighbor, data in self._adj[authID].items())
 
-        currAuthorID = authors[-1]
-        newNeighbors = set(self.neighbors(currAuthorID)).difference(set(authors))
+    def addAuthorNode(self, authID, authorClass):
+        self.add_node(authID, data=authorClass)
+        self.vertexIndices[authID] = len(self.vertexAuthors)
+        self.vertexAuthors.append(authID)
+        self.pendingVertices += 1
 
-        # base condition: stop at node if probStop hit or there are no new neighbors to traverse
-        if random.random() < probStop or len(newNeighbors) == 0:
-            # determine the paper topic
-            topics = self.determinePaperTopic(authors)
-            # update the papers for all authors
-            if (includeCredit):
-                self.updateAuthorPapersAndCredit(authors, topics, newPaperID, useReputation=False)
-            else:
-                self.updateAuthorPapers(authors, topics, newPaperID)
-            return topics, authors
-        
-        # create list representing probabilities for the neighboring nodes of the current coauthor
-        probs = []
-        for neighbor in newNeighbors:
-            nData = self.get_edge_data(currAuthorID, neighbor)
-            probs.extend([neighbor] * nData["weight"])
-
-        # Select next coauthor from neighbors probabilities list
-        coauthorID = random.choice(probs)
-
-        # update all edges of coauthors to this new author
-        for author in authors:
-            # if there is not an edge, create one
-            if not self.has_edge(author, coauthorID) and author != coauthorID:
-                self.add_edge(author, coauthorID, weight=0, width=1)
-            
-            newWeight = self.get_edge_data(author, coauthorID)["weight"] + 1
-            self.update(edges=[ (author, coauthorID, {"weight": newWeight}) ])
-
-        # add author to list and call function recursively
-        authors.append(coauthorID)
-        return self.biasedRandomWalk(authors, probStop, newPaperID, maxAge, includeCredit)
-
-    def getDisciplineAuthors(self, topicID):
+    def incrementCoauthorEdges(self, authors, coauthorID):
         '''
-        Returns a list of authors who would be in the discipline of the topicID
-        A community is defined as follows: Every author who has a majority of one topic in their papers
+        Function will increment the weights of the edges between all the authors and the new coauthor, creating edges that do not exist
+        Done in one pass over the adjacency dict of the coauthor instead of a general graph update per edge
+        Returns the list of touched edges as (authorID, coauthorID)
         '''
-        communityAuthors = []
-        for authID in self.nodes:
-            if topicID in self.getAuthorDiscipline(authID):
-                communityAuthors.append(authID)
+        coauthorAdj = self._adj[coauthorID]
+        touchedEdges = []
+        for author in authors:
+            if author == coauthorID:
+                continue
+            edgeData = coauthorAdj.get(author)
+            # if there is not an edge, create one
+            if edgeData is None:
+                self.add_edge(author, coauthorID, weight=1, width=1)
+                self.pendingEdges.append((self.vertexIndices[author], self.vertexIndices[coauthorID]))
+                self.coauthorEdgeAdded(author, coauthorID)
+            else:
+                edgeData["weight"] += 1
+            touchedEdges.append((author, coauthorID))
 
-        return communityAuthors
+        # cached sampling weights of the authors on the touched edges are no longer valid
+        self.sampler.invalidateEdges(touchedEdges)
+        return touchedEdges
 
-    def getAuthorswithTopic(self, topicID):
+    def getInducedEdges(self, authors):
         '''
-        Returns a list of authors who would have the given topic
+        Returns the authors in order of insertion and the unweighted edges of the subgraph induced by them
+        Edges are given as (i, j) positions in the returned authors, with i < j
         '''
-        topicAuthors = []
-        for authID, authClass in self.nodes.data('data'):
-            if topicID in authClass.getData():
-                topicAuthors.append(authID)
-
-        return topicAuthors
-
+        vertexAuthors = sorted(authors, key=self.vertexIndices.__getitem__)
+        positions = {authID: i for i, authID in enumerate(vertexAuthors)}
+        edges = []
+        for i, authID in enumerate(vertexAuthors):
+            for neighbor in self._adj[authID]:
+                j = positions.get(neighbor)
+                if j is not None and i < j:
+                    edges.append((i, j))
+        return vertexAuthors, edges
 
     def splitCommunity(self, authors, numClusters=2):
         '''
@@ -237,9 +139,12 @@ class Graph(nx.Graph):
             numClusters: number of clusters to testing splitting community into
         Returns a list of authors in the new community if community is split, False otherwise
         '''
-        # split into two communities
-        subGraph = self.subgraph(authors)
-        newGraph = modularityGraph.from_networkx(subGraph)
+        # split into two communities, extracting the community from the igraph mirror by vertex index
+        mirror = self.getIgraphMirror()
+        vertices = sorted(self.vertexIndices[authID] for authID in authors)
+        newGraph = mirror.induced_subgraph(vertices)
+        # vertices of the induced subgraph keep the order of their indices in the mirror
+        vertexAuthors = [self.vertexAuthors[vertex] for vertex in vertices]
 
         # create subgraph and split
         try:
@@ -248,7 +153,7 @@ class Graph(nx.Graph):
             return False
 
         # compare unweighted modularity of new communities to the initial, return if there should not be change in community structure
-        if newGraph.modularity(set(subGraph.nodes())) > clusters.modularity or len(clusters) != 2:
+        if newGraph.modularity(set(vertexAuthors)) > clusters.modularity or len(clusters) != 2:
             return False
         
         # coms = {}
@@ -268,65 +173,10 @@ class Graph(nx.Graph):
         # choose new cluster as the smaller one
         index = 1 if len(clusters[1]) < len(clusters[0]) else 0
 
-        return clusters[index]
+        # clusters contain the vertex indices of the induced subgraph
+        return [vertexAuthors[vertex] for vertex in clusters[index]]
 
 
-    def mergeCommunities(self, com1=[], com2=[]):
-        '''
-        Function will take the two communities as a list of authorIDs
-        Will check modularity and merge them 
-        Returns list of authors in merged community if merged, False otherwise
-        '''
-
-        # merge communities 
-        newCom = set(com1 + com2)
-        # return if no new commmunity
-        if len(newCom) == 0:
-            return False
-        subGraphMerged = self.subgraph(list(newCom))
-
-        # calculate modularities
-        try:
-            mergedMod = nx_modularity(subGraphMerged, [newCom], weight=None)
-        except ZeroDivisionError:
-            return False
-            print(f'New Community: {newCom}')
-            print(f'Com1: {com1} and Com2: {com2}')
-            self.plotPyvisGraph(filename='outputs/ErrorGraph.html', network=subGraphMerged)
-            self.plotPyvisGraph(filename='outputs/wholeErrorGraph.html')
-            print(f'Authors in community {com1}: {self.getDisciplineAuthors(com1)}')
-            print(f'Authors in community {com2}: {self.getDisciplineAuthors(com2)}')
-            self.saveNetworkWithPickle(fileName='outputs/wholeErrorNetwork.net')
-            self.saveNetworkWithPickle(fileName='outputs/partErrorNetwork.net', network=subGraphMerged)
-            print('Error with merging')
-            return False
-        # merge, authors that are in both communities will just be a part of the first
-        coms = dict.fromkeys(com1, 0) | dict.fromkeys(com2, 1)
-        unMergedMod = community.modularity(coms, subGraphMerged, weight=None)
-        # print(f'Mergining communities: {com1} and {com2}')
-        # print(f'Merged: {mergedMod}')
-        # print(f'Unmerged: {unMergedMod}')
-
-        if mergedMod < unMergedMod:
-            return False
-
-        return list(newCom)
-
-
-    def updatePaperInNetwork(self, paperID, paperData):
-        '''
-        Function will update the author network with the paper
-        PaperID: int
-        paperData: ([topics], [authors])
-        '''
-        paperTopics = paperData[0]
-        paperAuthors = paperData[1]
-
-        for authID, authClass in self.nodes.data("data"):
-            # can just update the authors of the paper
-            if authID in paperAuthors:
-                authClass.updateAuthor(paperID, paperTopics)
-
     '''Plotting Related Functions'''
     def genHTMLtable(self, authorID, width='500px'):
         html = '''
@@ -385,20 +235,6 @@ class Graph(nx.Graph):
         return output
         
 
-    def genGraphFeatures(self):
-        '''
-        Will return the dictionary for node labels and list of colors for plotting
-        Used for labels and colors in networkx graph drawing: https://networkx.org/documentation/latest/reference/generated/networkx.drawing.nx_pylab.draw_networkx.html?highlight=draw_networkx
-        '''
-        labels = {}
-        colors = []
-        for authID in self.nodes:
-            disciplines = self.getAuthorDiscipline(authID)
-            labels[authID] = f'{authID}: ' + ','.join(map(str, disciplines))
-            colors.append(4 * disciplines[0])
-        return labels, colors
-
-    
     def plotNetwork(self):
         nodeLabels, nodeColors = self.genGraphFeatures()
         # spring layout
@@ -0,0 +1,81 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+# communities with at most this many authors are split with a dense eigendecomposition, larger ones with ARPACK
+DENSE_MAX_VERTICES = 64
+# leading eigenvalues below this are treated as 0, i.e. there is no split that improves the modularity
+EIGENVALUE_TOLERANCE = 1e-8
+# components of the unit eigenvector below this are treated as 0, their sign is floating point noise
+EIGENVECTOR_TOLERANCE = 1e-8
+
+def adjacencyMatrix(numVertices, edges):
+    '''
+    Returns the unweighted symmetric adjacency matrix in CSR format, from the (i, j) vertex pairs of the edges
+    '''
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    cols = np.concatenate([edges[:, 1], edges[:, 0]])
+    return coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(numVertices, numVertices)).tocsr()
+
+def partitionModularity(numVertices, edges, membership):
+    '''
+    Returns the unweighted modularity of the partition, membership gives the community index of each vertex
+    '''
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    numEdges = len(edges)
+    if numEdges == 0:
+        return float('nan')
+    membership = np.asarray(membership, dtype=np.int64)
+    degrees = np.bincount(edges.ravel(), minlength=numVertices)
+    numCommunities = membership.max() + 1
+    internalEdges = np.bincount(membership[edges[:, 0]][membership[edges[:, 0]] == membership[edges[:, 1]]], minlength=numCommunities)
+    degreeSums = np.bincount(membership, weights=degrees, minlength=numCommunities)
+    return float(np.sum(internalEdges / numEdges - (degreeSums / (2 * numEdges)) ** 2))
+
+def leadingEigenvectorClusters(numVertices, edges):
+    '''
+    Function will split the graph in the same way as igraph's community_leading_eigenvector(clusters=2)
+        Every connected component starts as its own community, if the graph is connected it is split in two by the signs of
+        the leading eigenvector of its modularity matrix B = A - k k^T / 2m
+    B is never formed for large graphs, ARPACK only needs the products A x - k (k . x) / 2m on the sparse adjacency matrix
+    Returns the community index of each vertex, starting from 0 with the community of the first vertex
+    '''
+    adjacency = adjacencyMatrix(numVertices, edges)
+    numComponents, components = connected_components(adjacency, directed=False)
+    if numComponents > 1 or numVertices < 2:
+        return components
+
+    degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+    twiceEdges = degrees.sum()
+    if numVertices <= DENSE_MAX_VERTICES:
+        modularityMatrix = adjacency.toarray() - np.outer(degrees, degrees) / twiceEdges
+        eigenvalues, eigenvectors = np.linalg.eigh(modularityMatrix)
+        eigenvalue, eigenvector = eigenvalues[-1], eigenvectors[:, -1]
+    else:
+        operator = LinearOperator((numVertices, numVertices), dtype=np.float64,
+                                  matvec=lambda x: adjacency @ x - degrees * (degrees @ x) / twiceEdges)
+        # fixed start vector, so that the split does not depend on any random state
+        startVector = np.random.default_rng(0).uniform(-1, 1, numVertices)
+        eigenvalues, eigenvectors = eigsh(operator, k=1, which='LA', v0=startVector)
+        eigenvalue, eigenvector = eigenvalues[0], eigenvectors[:, 0]
+
+    # no split improves the modularity
+    if eigenvalue <= EIGENVALUE_TOLERANCE:
+        return np.zeros(numVertices, dtype=np.int64)
+
+    # as in igraph, the first component that is not 0 is made positive and the vertices with 0 components join its side
+    nonZero = np.flatnonzero(np.abs(eigenvector) >= EIGENVECTOR_TOLERANCE)
+    if len(nonZero) and eigenvector[nonZero[0]] < 0:
+        eigenvector = -eigenvector
+    membership = (eigenvector <= -EIGENVECTOR_TOLERANCE).astype(np.int64)
+    # vertices on the side of the first vertex are community 0
+    if membership[0] == 1:
+        membership = 1 - membership
+
+    # the modularity change of the split is s^T B s / 4m, the split is only made if it is positive
+    signs = 1 - 2 * membership
+    if signs @ (adjacency @ signs) - (degrees @ signs) ** 2 / twiceEdges <= EIGENVALUE_TOLERANCE:
+        return np.zeros(numVertices, dtype=np.int64)
+    return membership
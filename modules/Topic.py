@@ -2,39 +2,43 @@ class Topic:
     '''
     Class defines the papers and their corresponding methods
     '''
+    __slots__ = ('id', 'papers', 'disciplineAuthors')
+
     def __init__(self, id, papers=[], discAuthors=[]):
 
         self.id = id
-        self.papers = list(set(papers))
+        # dicts are used as insertion ordered sets
+        self.papers = dict.fromkeys(papers)
 
-        # list of authors who count topic as one of their main disciplines
-        self.disciplineAuthors = list(set(discAuthors))
+        # authors who count topic as one of their main disciplines
+        self.disciplineAuthors = dict.fromkeys(discAuthors)
 
     def getPapers(self):
-        return self.papers
+        return list(self.papers)
+
+    def hasPaper(self, paperID):
+        return paperID in self.papers
     
     def getNumPapers(self):
         return len(self.papers)
 
     def getAuthors(self):
-        return self.disciplineAuthors
+        return list(self.disciplineAuthors)
 
     def getNumDiscAuthors(self):
         return len(self.disciplineAuthors)
 
     def addPaper(self, paperID):
-        if paperID not in self.papers:
-            self.papers.append(paperID)
+        self.papers[paperID] = None
 
     def addAuthorToDiscipline(self, authorClass):
-        if authorClass not in self.disciplineAuthors:
-            self.disciplineAuthors.append(authorClass)
+        self.disciplineAuthors[authorClass] = None
 
     def removeAuthorFromDiscipline(self, authID):
-        self.disciplineAuthors.remove(authID)
+        del self.disciplineAuthors[authID]
 
     def removePaper(self, paperID):
-        self.papers.remove(paperID)
+        del self.papers[paperID]
 
     def __repr__(self):
         # return f'{{"id": {self.id}\n, "authors": {self.disciplineAuthors}\n, "papers": {self.papers}\n}}'
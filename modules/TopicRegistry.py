@@ -0,0 +1,72 @@
+from .Topic import Topic
+from .RandomSet import RandomSet
+
+class TopicRegistry:
+    '''
+    Class keeps the topics of the model, allocating new topicIDs and retiring topics that no longer have papers
+    TopicIDs come from a counter that only increases, so the ID of a retired topic is never given to a new one
+    '''
+    def __init__(self):
+        # live topics, in the form { topicID: Topic }
+        self.topics = {}
+        # live topicIDs, used for uniform random choice
+        self.liveTopics = RandomSet()
+        # topicIDs of the topics that were retired
+        self.retiredTopics = set()
+        self.nextTopicID = 1
+
+    '''Access Methods'''
+    def getTopics(self):
+        return self.topics
+
+    def getTopic(self, topicID):
+        return self.topics[topicID]
+
+    def getNumTopics(self):
+        return len(self.topics)
+
+    def isRetired(self, topicID):
+        return topicID in self.retiredTopics
+
+    def randomTopic(self):
+        '''
+        Returns a uniformly chosen live topicID
+        '''
+        return self.liveTopics.choice()
+
+    def __contains__(self, topicID):
+        return topicID in self.topics
+
+    '''Lifecycle Methods'''
+    def newTopicID(self):
+        '''
+        Returns an unused topicID, the topic is only added when addTopic is called with it
+        '''
+        topicID = self.nextTopicID
+        self.nextTopicID += 1
+        return topicID
+
+    def addTopic(self, topicID, papers=[]):
+        '''
+        Adds the live topic with the topicID, returns the Topic class
+        '''
+        self.topics[topicID] = Topic(topicID, papers=papers)
+        self.liveTopics.add(topicID)
+        self.retiredTopics.discard(topicID)
+        if topicID >= self.nextTopicID:
+            self.nextTopicID = topicID + 1
+        return self.topics[topicID]
+
+    def retireTopic(self, topicID):
+        del self.topics[topicID]
+        self.liveTopics.remove(topicID)
+        self.retiredTopics.add(topicID)
+
+    def retireIfEmpty(self, topicID):
+        '''
+        Retires the topic if it has no papers left, returns True if it was retired
+        '''
+        if topicID in self.topics and self.topics[topicID].getNumPapers() == 0:
+            self.retireTopic(topicID)
+            return True
+        return False
@@ -2,14 +2,15 @@ class Type:
     '''
     Class defined the type of the author, used to determine the amount of credit that they get for papers
     '''
+    __slots__ = ('id', 'name', 'authors', 'scalar', 'totalCredit')
 
     def __init__(self, id, name, discAuthors=[]):
 
         self.id = id
         self.name = name
 
-        # authors with the type
-        self.authors = list(set(discAuthors))
+        # authors with the type, dict is used as an insertion ordered set
+        self.authors = dict.fromkeys(discAuthors)
         
         # credit
         self.scalar = id + 1
@@ -17,18 +18,23 @@ class Type:
         self.totalCredit = 0 # will represent how much accumulated credit for the whole type
 
     def getAuthors(self):
-        return self.authors
+        return list(self.authors)
 
     def getTotalCredit(self):
         return self.totalCredit
 
     def addAuthor(self, authID):
-        if authID not in self.authors:
-            self.authors.append(authID)
+        self.authors[authID] = None
 
     def getCreditAmount(self, baseCredit):
         '''
         Defines the rule for collaboration between different types
+        The total credit of the type is not changed, it is updated with addCredit
         '''
-        self.totalCredit += baseCredit * self.scalar
-        return baseCredit * self.scalar
\ No newline at end of file
+        return baseCredit * self.scalar
+
+    def addCredit(self, creditAmount):
+        '''
+        Adds to the accumulated credit of the type, e.g. the total given to all of its authors on a paper
+        '''
+        self.totalCredit += creditAmount
\ No newline at end of file
@@ -44,7 +44,12 @@ def runSimulation(simulationObj):
     csvFile = f"./csv/model-{simulationObj['modelType']}/{simulationObj['simulationName']}.csv"
     print(f'Saving to ' + csvFile)
 
-    authorIDs = model.getAuthorIDs()
+    # author columns are read from the author store and the degree array, in order of insertion
+    authorStore = model.getNetwork().getAuthorStore()
+    authorIDs = authorStore.getIDs().tolist()
+    authorDegrees = model.getNetwork().getDegrees()
+    authorCredits = authorStore.getCredits().tolist()
+    authorTypes = authorStore.getTypeNames()
     numAuthors = len(authorIDs)
     lenDistrib = len(distrib3[0])
     print(f'{numAuthors} {lenDistrib}')
@@ -56,9 +61,9 @@ def runSimulation(simulationObj):
         write.writerow(["author-id", 'author-degree', 'author-credit', 'author-type', "", "percent-marg-x", "avg-credit-y", "num-authors"])
         for rowNum in range(max(numAuthors, lenDistrib)):
             cell1 = None if rowNum >= numAuthors else authorIDs[rowNum]
-            cell2 = None if rowNum >= numAuthors else model.getNetwork().degree[authorIDs[rowNum]]
-            cell3 = None if rowNum >= numAuthors else model.getNetwork().getAuthorClass(authorIDs[rowNum]).getCredit()
-            cell4 = None if rowNum >= numAuthors else model.getNetwork().getAuthorClass(authorIDs[rowNum]).getType().name
+            cell2 = None if rowNum >= numAuthors else authorDegrees[rowNum]
+            cell3 = None if rowNum >= numAuthors else authorCredits[rowNum]
+            cell4 = None if rowNum >= numAuthors else authorTypes[rowNum]
             cell5 = None
             cell6 = None if rowNum >= lenDistrib else distrib3[0][rowNum]
             cell7 = None if rowNum >= lenDistrib else distrib3[1][rowNum]
@@ -0,0 +1,92 @@
+import random
+import pytest
+from igraph import Graph as modularityGraph
+from modules.ScholarNetwork import Graph
+from modules.ArrayNetwork import ArrayGraph
+from modules.SpectralSplit import partitionModularity, DENSE_MAX_VERTICES
+
+'''
+The spectral splitter must accept and reject the same splits as igraph's leading eigenvector method, on fixed graphs
+Graphs are given as (numAuthors, [(i, j)]) with authors 0 to numAuthors - 1, added to the networks as authors 1 to numAuthors
+'''
+
+def plantedPartition(groupSize, pIn, pOut, seed):
+    '''
+    Returns two groups of groupSize authors with edge probability pIn inside the groups and pOut between them
+    '''
+    rng = random.Random(seed)
+    numAuthors = 2 * groupSize
+    edges = [(i, j) for i in range(numAuthors) for j in range(i + 1, numAuthors)
+             if rng.random() < (pIn if (i < groupSize) == (j < groupSize) else pOut)]
+    return numAuthors, edges
+
+def twoCliques(cliqueSize):
+    '''
+    Returns two cliques of cliqueSize authors joined by one edge
+    '''
+    edges = [(i, j) for i in range(cliqueSize) for j in range(i + 1, cliqueSize)]
+    edges += [(cliqueSize + i, cliqueSize + j) for i, j in edges]
+    return 2 * cliqueSize, edges + [(0, cliqueSize)]
+
+GRAPHS = {
+    'edgeless pair': (2, []),
+    'edgeless triple': (3, []),
+    'single author': (1, []),
+    'two components': (5, [(0, 1), (1, 2), (0, 2), (3, 4)]),
+    'three components': (6, [(0, 1), (2, 3), (4, 5)]),
+    'complete': (6, [(i, j) for i in range(6) for j in range(i + 1, 6)]),
+    'two cliques': twoCliques(5),
+    'planted partition': plantedPartition(50, 0.3, 0.01, seed=1),
+    # the leading eigenvector has components that are 0 in exact arithmetic
+    'zero components': (6, [(0, 1), (0, 2), (0, 4), (0, 5), (1, 2), (1, 3), (1, 4), (2, 4)]),
+}
+
+def buildNetwork(networkClass, numAuthors, edges):
+    network = networkClass()
+    for authID in range(1, numAuthors + 1):
+        network.addAuthor(authID, birthIteration=authID, initialData={1: [authID]})
+    for i, j in edges:
+        network.incrementCoauthorEdges([i + 1], j + 1)
+    return network
+
+@pytest.mark.parametrize('networkClass', [Graph, ArrayGraph])
+@pytest.mark.parametrize('graphName', list(GRAPHS))
+def test_spectral_split_agrees_with_igraph(networkClass, graphName):
+    numAuthors, edges = GRAPHS[graphName]
+    network = buildNetwork(networkClass, numAuthors, edges)
+    authors = list(range(1, numAuthors + 1))
+
+    # igraph draws its start vector from the random module
+    random.seed(0)
+    igraphSplit = network.splitCommunity(authors)
+    spectralSplit = network.spectralSplitCommunity(authors)
+    if igraphSplit is False:
+        assert spectralSplit is False
+    else:
+        assert sorted(spectralSplit) == sorted(igraphSplit)
+
+def test_fixed_graphs_cover_both_solvers():
+    # the planted partition is connected and large enough for the sparse solver
+    assert GRAPHS['planted partition'][0] > DENSE_MAX_VERTICES
+    assert modularityGraph(*GRAPHS['planted partition']).is_connected()
+
+@pytest.mark.parametrize('graphName', ['two components', 'two cliques', 'planted partition'])
+def test_partition_modularity_agrees_with_igraph(graphName):
+    numAuthors, edges = GRAPHS[graphName]
+    graph = modularityGraph(n=numAuthors, edges=edges)
+    random.seed(0)
+    membership = graph.community_leading_eigenvector(clusters=2).membership
+    assert partitionModularity(numAuthors, edges, membership) == pytest.approx(graph.modularity(membership))
+
+@pytest.mark.parametrize('graphName', ['two cliques', 'planted partition'])
+def test_networkx_export_splits_like_array_graph(graphName):
+    numAuthors, edges = GRAPHS[graphName]
+    network = buildNetwork(ArrayGraph, numAuthors, edges)
+    exported = network.toNetworkx()
+    authors = list(range(1, numAuthors + 1))
+
+    random.seed(0)
+    arraySplit = network.splitCommunity(authors)
+    random.seed(0)
+    assert sorted(exported.splitCommunity(authors)) == sorted(arraySplit)
+    assert exported.getDisciplineAuthors(1) == network.getDisciplineAuthors(1)